@@ -24,7 +24,20 @@ default_settings = {
     "scrapingToolDirectory": os.path.join(os.path.dirname(__file__), "scrapers"), # Default: ./scrapers
     "scrapingTools": {},
     "dataDirectory": os.path.join(os.path.dirname(__file__), "data"), # Default: ./data
+    "extractedTextDirectory": os.path.join(os.path.dirname(__file__), "data", "extracted_text"), # Columnar text store built by corpus_extractor.py
+    "corpusIndexPath": os.path.join(os.path.dirname(__file__), "data", "corpus_index.db"), # Full-text search store built by corpus_search.py
     "defaultScraper": "", # Name of the scraper to use as a fallback
+    "prefetchDepth": 3, # Number of upcoming MID entries loaded in the background during review
+    "renderCacheMB": 256, # Memory budget for rendered pages shared by the viewer and scrapers
+    "scrapeCacheDirectory": os.path.join(os.path.dirname(__file__), "data", "scrape_cache"), # Stored scraper results shared by the review app and the audit
+    "scrapeCacheMB": 512, # Disk budget for stored scraper results, 0 disables the cache
+    "reviewStorePath": "", # Shared SQLite file for splitting the MID between reviewers (blank: review alone)
+    "reviewerName": "", # Name decisions are recorded under (blank: user@computer)
+    "reviewBatchSize": 20, # MID rows leased to a reviewer at a time
+    "reviewLeaseMinutes": 30, # Leases not renewed for this long are handed to other reviewers
+    "scraperWorkers": 0, # Worker processes that run expensive scraping tools in isolation (0: run them in the app's own process)
+    "scraperTimeoutSeconds": 300, # A page still being scraped after this long is abandoned and its worker restarted
+    "scraperMaxMemoryMB": 4096, # A scraper worker using more memory than this is restarted
     "userMode": "User"
 }
 
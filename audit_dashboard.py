@@ -0,0 +1,123 @@
+# audit_dashboard.py
+# Live view of a running MID audit: progress, pass/fail counts, failures per test, rows/sec and ETA.
+# Reviewing failures is available while the audit runs, over the rows finished so far.
+
+import time
+from collections import deque
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton, QComboBox, QTableWidget,
+    QTableWidgetItem, QHeaderView
+)
+from PyQt5.QtCore import pyqtSignal
+
+
+# Rows/sec is measured over this many most recent rows, so the ETA follows changes in pace
+RATE_WINDOW_ROWS = 50
+
+
+def _format_duration(seconds):
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
+
+
+class AuditDashboard(QDialog):
+    stop_requested = pyqtSignal()
+    review_requested = pyqtSignal(str)  # test name
+
+    def __init__(self, test_names, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("MID Audit")
+        self.setModal(False)
+        self.resize(420, 460)
+
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("Starting audit...")
+        self.status_label.setStyleSheet("font-weight: bold;")
+        layout.addWidget(self.status_label)
+
+        self.progress_bar = QProgressBar()
+        layout.addWidget(self.progress_bar)
+
+        self.counts_label = QLabel("PASS: 0    FAIL: 0    TIMEOUT: 0")
+        layout.addWidget(self.counts_label)
+        self.rate_label = QLabel("Rate: -    ETA: -")
+        layout.addWidget(self.rate_label)
+
+        # Failures per test, filled as rows arrive
+        self.failure_table = QTableWidget(len(test_names), 2)
+        self.failure_table.setHorizontalHeaderLabels(["Test", "Failures"])
+        self.failure_table.verticalHeader().setVisible(False)
+        self.failure_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.failure_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.failure_rows = {}
+        for i, name in enumerate(test_names):
+            self.failure_table.setItem(i, 0, QTableWidgetItem(name))
+            self.failure_table.setItem(i, 1, QTableWidgetItem("0"))
+            self.failure_rows[name] = i
+        layout.addWidget(self.failure_table)
+
+        review_layout = QHBoxLayout()
+        self.review_combo = QComboBox()
+        self.review_combo.addItems(test_names)
+        review_layout.addWidget(self.review_combo)
+        review_btn = QPushButton("Review Failures So Far")
+        review_btn.clicked.connect(lambda: self.review_requested.emit(self.review_combo.currentText()))
+        review_layout.addWidget(review_btn)
+        layout.addLayout(review_layout)
+
+        self.stop_btn = QPushButton("Stop Audit")
+        self.stop_btn.clicked.connect(self.on_stop_clicked)
+        layout.addWidget(self.stop_btn)
+
+        self.counts = {"PASS": 0, "FAIL": 0, "TIMEOUT": 0}
+        self.failures = {}
+        self.start_time = time.monotonic()
+        self.finish_times = deque(maxlen=RATE_WINDOW_ROWS + 1)
+
+    def start(self, total_rows):
+        self.counts = {"PASS": 0, "FAIL": 0, "TIMEOUT": 0}
+        self.failures = {}
+        self.start_time = time.monotonic()
+        self.finish_times.clear()
+        self.finish_times.append(self.start_time)
+        self.progress_bar.setRange(0, total_rows)
+        self.progress_bar.setValue(0)
+        for row in self.failure_rows.values():
+            self.failure_table.item(row, 1).setText("0")
+        self.status_label.setText(f"Auditing {total_rows:,} rows...")
+        self.stop_btn.setEnabled(True)
+
+    def add_result(self, entry, done, total):
+        self.counts[entry["status"]] = self.counts.get(entry["status"], 0) + 1
+        for test, result in entry["tests"].items():
+            if result in ("PASS", "TIMEOUT"):
+                continue
+            self.failures[test] = self.failures.get(test, 0) + 1
+            if test in self.failure_rows:
+                self.failure_table.item(self.failure_rows[test], 1).setText(f"{self.failures[test]:,}")
+
+        self.progress_bar.setValue(done)
+        self.counts_label.setText(
+            f"PASS: {self.counts['PASS']:,}    FAIL: {self.counts['FAIL']:,}    "
+            f"TIMEOUT: {self.counts['TIMEOUT']:,}    Fatal: {self.failures.get('fatal', 0):,}"
+        )
+
+        self.finish_times.append(time.monotonic())
+        elapsed = self.finish_times[-1] - self.finish_times[0]
+        if elapsed > 0:
+            rate = (len(self.finish_times) - 1) / elapsed
+            eta = (total - done) / rate
+            self.rate_label.setText(f"Rate: {rate:.2f} rows/sec    ETA: {_format_duration(eta)}")
+        self.status_label.setText(f"Audited {done:,} of {total:,} rows")
+
+    def finish(self, message):
+        self.status_label.setText(message)
+        self.rate_label.setText(f"Total time: {_format_duration(time.monotonic() - self.start_time)}")
+        self.stop_btn.setEnabled(False)
+
+    def on_stop_clicked(self):
+        self.stop_btn.setEnabled(False)
+        self.status_label.setText("Stopping after the current row...")
+        self.stop_requested.emit()
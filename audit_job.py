@@ -0,0 +1,123 @@
+# audit_job.py
+# Runs the MID audit in a separate process so model inference never competes with the UI.
+# The worker streams each finished row back through a multiprocessing queue, and AuditJob
+# re-emits them as Qt signals from a polling timer on the UI thread.
+
+import multiprocessing
+import queue
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from logger import setup_logger
+
+
+# How often the UI drains results from the worker
+POLL_INTERVAL_MS = 200
+# How long a cancelled worker gets to save its partial report before it is terminated
+STOP_GRACE_S = 10
+
+
+def _audit_worker(mid_df, settings, results, stop_event):
+    # Imported here so only the worker process loads the scrapers and their models
+    from mid_manager import MIDManager
+    from audit_runner import run_mid_audit
+    try:
+        mid_manager = MIDManager(df=mid_df)
+        output_path = run_mid_audit(
+            mid_manager, settings,
+            on_result=lambda entry, done, total: results.put(("row", entry, done, total)),
+            should_stop=stop_event.is_set
+        )
+        results.put(("done", output_path))
+    except Exception as e:
+        results.put(("error", str(e)))
+
+
+class AuditJob(QObject):
+    row_finished = pyqtSignal(dict, int, int)   # audit entry, rows done, total rows
+    finished = pyqtSignal(str, bool)            # report path, stopped early
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.logger = setup_logger()
+        # Spawned rather than forked, forking a process that runs Qt threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._process = None
+        self._results = None
+        self._stop_event = None
+        self._timer = QTimer(self)
+        self._timer.setInterval(POLL_INTERVAL_MS)
+        self._timer.timeout.connect(self._poll)
+
+    def is_running(self):
+        return self._process is not None
+
+    def start(self, mid_df, settings):
+        """Audits a copy of the given MID rows in a worker process."""
+        if self.is_running():
+            raise RuntimeError("An audit is already running")
+        self._results = self._context.Queue()
+        self._stop_event = self._context.Event()
+        # Not a daemon: the audit may start its own scraper worker processes (scraperWorkers setting),
+        # which daemon processes aren't allowed to do. shutdown() makes sure it doesn't outlive the app.
+        self._process = self._context.Process(
+            target=_audit_worker, args=(mid_df, dict(settings), self._results, self._stop_event),
+            name="mid-audit", daemon=False
+        )
+        self._process.start()
+        self._timer.start()
+        self.logger.info(f"Started MID audit of {len(mid_df):,} rows in process {self._process.pid}")
+
+    def stop(self):
+        """Asks the worker to stop after the current row; it still saves the rows it finished."""
+        if self.is_running():
+            self._stop_event.set()
+            QTimer.singleShot(STOP_GRACE_S * 1000, self._terminate_if_running)
+            self.logger.info("Stopping MID audit")
+
+    def shutdown(self):
+        """Stops the audit before the app exits, waiting up to STOP_GRACE_S for it to save its partial report."""
+        if self.is_running():
+            self._stop_event.set()
+            self._process.join(timeout=STOP_GRACE_S)
+            if self._process.is_alive():
+                self.logger.warning("MID audit did not stop in time, terminating it")
+                self._process.terminate()
+            self._cleanup()
+
+    def _terminate_if_running(self):
+        if self.is_running() and self._stop_event.is_set():
+            self.logger.warning("MID audit did not stop in time, terminating it")
+            self._process.terminate()
+
+    def _poll(self):
+        # Checked before draining: anything the worker sent before exiting is already in the queue
+        alive = self._process.is_alive()
+        while True:
+            try:
+                message = self._results.get_nowait()
+            except queue.Empty:
+                break
+            kind = message[0]
+            if kind == "row":
+                self.row_finished.emit(*message[1:])
+            elif kind == "done":
+                stopped = self._stop_event.is_set()
+                self._cleanup()
+                self.finished.emit(message[1], stopped)
+                return
+            elif kind == "error":
+                self._cleanup()
+                self.failed.emit(message[1])
+                return
+
+        # The worker died without reporting back (crash or terminate)
+        if not alive:
+            exit_code = self._process.exitcode
+            self._cleanup()
+            self.failed.emit(f"Audit process exited unexpectedly (exit code {exit_code})")
+
+    def _cleanup(self):
+        self._timer.stop()
+        self._process.join(timeout=1)
+        self._process = None
+        self._results = None
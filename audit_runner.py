@@ -7,25 +7,89 @@ import re
 import pandas as pd
 from logger import setup_logger
 from scraper_loader import load_scraper_class
+from corpus_search import CorpusSearchIndex
+from corpus_extractor import PrecomputedText
+from scrape_cache import get_scrape_cache, scrape_with_cache
+from scraper_pool import get_scraper_pool, ScrapeTimeout, ScrapeWorkerError
 
 
-def run_mid_audit(mid_manager, settings):
+# TableScraper loads its models at import. When the scraper pool runs it, the audit process only
+# holds a stand-in and the tool is loaded in the workers alone.
+def _table_scraper_class(scraper_pool):
+    path = os.path.join(os.path.dirname(__file__), "scrapers", "table_scraper.py")
+    if scraper_pool is not None:
+        try:
+            stand_in = scraper_pool.remote_class(path)
+            if stand_in.process_safe and stand_in.cost_class != "cheap":
+                return stand_in
+        except (ScrapeTimeout, ScrapeWorkerError) as e:
+            setup_logger().warning(f"Scraper workers could not load {path}, loading it in the audit process: {e}")
+    return load_scraper_class(path)
+
+
+def run_mid_audit(mid_manager, settings, on_result=None, should_stop=None):
+    """
+    Runs every test on every MID row and saves the report and summary to the log directory.
+
+    Parameters:
+        mid_manager: MIDManager holding the rows to audit
+        settings: application settings dictionary
+        on_result: optional callable(entry, rows_done, total_rows), called as each row finishes
+        should_stop: optional callable returning True to end the audit early; the rows done so far are still saved,
+            to audit_report.partial.json and audit_summary.partial.json
+    """
     logger = setup_logger()
     logger.info("Starting structured MID audit")
         # Create output folder
     output_dir = os.path.join("logs", "table_detections")
     os.makedirs(output_dir, exist_ok=True)
 
-    total_rows = len(mid_manager.df)
+    total_rows = len(mid_manager)
     results = []
     summary = {
         "total_entries": total_rows,
-        "status_counts": {"PASS": 0, "FAIL": 0},
+        "status_counts": {"PASS": 0, "FAIL": 0, "TIMEOUT": 0},
         "test_failures": {},  # test_name -> failure count
+        "test_timeouts": {},  # test_name -> rows where the scraper was cut off by scraperTimeoutSeconds
         "failures_by_agency": {},  # agency -> { year -> [failed_test1, ...]}
         "outcomes_by_format_type": {},  # format_type -> {"PASS": x, "FAIL": y, "failed tests": { test_name: count}}
     }
 
+    # Optional full-text store built by corpus_search.py. When present, text that a *_match test
+    # could not find on the listed pages is looked up in the rest of the document.
+    corpus_index = None
+    index_path = settings.get("corpusIndexPath", "")
+    if index_path and os.path.isfile(index_path):
+        corpus_index = CorpusSearchIndex(index_path)
+        logger.info(f"Using corpus search index at {index_path}")
+
+    # Optional text store built by corpus_extractor.py, read instead of re-extracting unchanged PDFs
+    precomputed = PrecomputedText.from_settings(settings) if settings.get("extractedTextDirectory") else None
+    # Scraper results shared with the review app; pages scraped by either are not scraped again
+    scrape_cache = get_scrape_cache(settings)
+    # Worker processes for expensive tools (e.g. table detection), so a page that hangs only times out its row
+    scraper_pool = get_scraper_pool(settings)
+    TextScraperClass = load_scraper_class(os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py"))
+    TableScraperClass = _table_scraper_class(scraper_pool)
+
+    # Plain text of one zero-indexed page, as TextScraper would return it
+    def get_page_text(row, doc, page_num):
+        agency_yr = row.get("agency_yr", "")
+        if precomputed is not None and precomputed.is_current(agency_yr, doc.name):
+            text = precomputed.page_text(agency_yr, page_num)
+            if text is not None:
+                return text
+        scraper = TextScraperClass(doc.load_page(page_num))
+        return scrape_with_cache(scraper, scrape_cache, scraper_pool).get("text", "")[0]
+
+    # MID field checked by each *_match test
+    match_fields = {
+        "keyword_match": "Table Name/Word Search Keyword",
+        "stratobj_match": "stratobj",
+        "obj_match": "obj",
+        "goal_match": "goal",
+    }
+
 
     # Define test suite
     def test_pdf_found(row, doc, page_indices, settings):
@@ -38,16 +102,9 @@ def run_mid_audit(mid_manager, settings):
         if not page_indices:
             return False
 
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
-
         for page_num in page_indices:
             try:
-                page = doc.load_page(page_num)
-                scraper = ScraperClass(page)
-                scraper.scrape()
-                result = scraper.result
-                text = bool(result.get("text", [])[0].strip())
+                text = bool(get_page_text(row, doc, page_num).strip())
                 if not text:
                     return False    # Fail on first non-scraped page
             except Exception as e:
@@ -61,16 +118,9 @@ def run_mid_audit(mid_manager, settings):
         if not keyword:
             return True  # Nothing to match = PASS
 
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
-
         for page_num in page_indices:
             try:
-                page = doc.load_page(page_num)
-                scraper = ScraperClass(page)
-                scraper.scrape()
-                result = scraper.result
-                text = result.get("text", "")[0].lower()
+                text = get_page_text(row, doc, page_num).lower()
                 if keyword.lower() in text:
                     return True  # Match found = PASS
             except Exception as e:
@@ -84,16 +134,9 @@ def run_mid_audit(mid_manager, settings):
         if not stratobj:
             return True  # Nothing to match = PASS
 
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
-
         for page_num in page_indices:
             try:
-                page = doc.load_page(page_num)
-                scraper = ScraperClass(page)
-                scraper.scrape()
-                result = scraper.result
-                text = result.get("text", "")[0].lower()
+                text = get_page_text(row, doc, page_num).lower()
                 if stratobj.lower() in text:
                     return True  # Match found = PASS
             except Exception as e:
@@ -107,16 +150,9 @@ def run_mid_audit(mid_manager, settings):
         if not obj:
             return True  # Nothing to match = PASS
 
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
-
         for page_num in page_indices:
             try:
-                page = doc.load_page(page_num)
-                scraper = ScraperClass(page)
-                scraper.scrape()
-                result = scraper.result
-                text = result.get("text", "")[0].lower()
+                text = get_page_text(row, doc, page_num).lower()
                 if obj.lower() in text:
                     return True  # Match found = PASS
             except Exception as e:
@@ -133,16 +169,9 @@ def run_mid_audit(mid_manager, settings):
         if not goal:
             return True  # Nothing to match = PASS
 
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "text_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
-
         for page_num in page_indices:
             try:
-                page = doc.load_page(page_num)
-                scraper = ScraperClass(page)
-                scraper.scrape()
-                result = scraper.result
-                text = result.get("text", "")[0].lower()
+                text = get_page_text(row, doc, page_num).lower()
                 if goal.lower() in text:
                     return True  # Match found = PASS
             except Exception as e:
@@ -157,21 +186,23 @@ def run_mid_audit(mid_manager, settings):
             return True
 
         logger.debug(f"Using MTT to detect tables in {row.get("agency_yr","")}")
-        scraper_path = os.path.join(os.path.dirname(__file__), "scrapers", "table_scraper.py")
-        ScraperClass = load_scraper_class(scraper_path)
+        ScraperClass = TableScraperClass
 
         try:
             for page_num in page_indices:
                 page = doc.load_page(page_num)
                 scraper = ScraperClass([page])
-                scraper.scrape()
-                result = scraper.result
+                result = scrape_with_cache(scraper, scrape_cache, scraper_pool)
                 num_tables = len(result.get("tables",[]))
                 if num_tables > 0:
                     logger.debug(f"{num_tables} table(s) found in {row.get("agency_yr")} page {page_num+1}, creating visualization")
                     # Save image to file with page number
                     output_path = os.path.join(output_dir, f"{row.get('agency_yr','unknown')}_page_{page_num+1}.png")
-                    result.get("images")[0].save(output_path)
+                    if hasattr(scraper, "render_overlay"):
+                        overlay = scraper.render_overlay(0)
+                    else:
+                        overlay = scraper_pool.call(scraper, "render_overlay", 0)
+                    overlay.save(output_path)
                     logger.debug("Diagnostic Image Saved")
                     # Save structure content to text file
                     table_payloads = result.get("tables", [])
@@ -195,6 +226,8 @@ def run_mid_audit(mid_manager, settings):
                                 f.write("\n".join(txt_lines))
                             logger.debug(f"Structure data saved to {struct_path}")
                     return True # Pass if any page detects a table
+        except ScrapeTimeout:
+            raise   # Reported as a TIMEOUT outcome by the audit loop, not as a missing table
         except Exception as e:
             logger.warning(f"table_detected error on {row.get('agency_yr')}: {e}")
             return False 
@@ -213,90 +246,141 @@ def run_mid_audit(mid_manager, settings):
         ("table_detected", test_table_detected),
     ]
 
-    # Loop over each row in the MID to run tests
-    for i in range(total_rows):
-        mid_manager.current_index = i
-        row = mid_manager.get_current_row()
-        agency_yr = row.get("agency_yr", f"UNKNOWN_{i}")
-        agency = row.get("agency", "UNKNOWN")
-        year = row.get("year", "UNKNOWN")
-        format_type = row.get("Format_Type", "UNKNOWN")
-        stratobj = row.get("stratobj", "UNKNOWN")
-        obj = row.get("obj", "UNKNOWN")
-        goal = row.get("goal", "UNKNOWN")
-        label = f"{row.get('agency', 'UNKNOWN')} ({row.get('year', 'UNKNOWN')})"
-        logger.debug(f"Auditing line {i} of {total_rows}")
-
-        entry = {
-            "index": i+1, # Convert to 1-indexed for human readers
-            "agency_yr": agency_yr,
-            "agency": agency,
-            "year": int(year) if pd.notna(year) else "UNKNOWN",
-            "format_type": int(format_type) if pd.notna(format_type) else "UNKNOWN",
-            "stratobj": stratobj,
-            "obj": obj,
-            "goal": goal,
-            "label": label,
-            "tests": {},
-            "status": "PASS"
-        }
+    def open_document(agency_yr):
+        filename = f"{agency_yr.replace('-', '_')}.pdf"
+        path = os.path.join(settings.get("dataDirectory", ""), filename)
+        if not os.path.isfile(path):
+            raise FileNotFoundError(f"Missing file: {filename}")
+        return fitz.open(path)
 
+    # Loop over the MID one document at a time, so each PDF is opened once for all of its rows
+    stopped = False
+    for doc_agency_yr, row_indices in mid_manager.document_groups():
         try:
-            filename = f"{agency_yr.replace('-', '_')}.pdf"
-            path = os.path.join(settings.get("dataDirectory", ""), filename)
-            if not os.path.isfile(path):
-                raise FileNotFoundError(f"Missing file: {filename}")
-
-            doc = fitz.open(path)
-            page_indices = mid_manager.parse_pdf_pages()
-
-            for test_name, test_func in tests:
-                try:
-                    passed = test_func(row, doc, page_indices, settings)
-                    entry["tests"][test_name] = "PASS" if passed else "FAIL"
-                    if not passed:
+            doc, doc_error = open_document(doc_agency_yr), None
+        except Exception as e:
+            doc, doc_error = None, e
+
+        for i in row_indices:
+            if should_stop is not None and should_stop():
+                logger.warning(f"Audit stopped after {len(results)} of {total_rows} rows")
+                stopped = True
+                break
+            mid_manager.current_index = i
+            row = mid_manager.get_current_row()
+            agency_yr = row.get("agency_yr", f"UNKNOWN_{i}")
+            agency = row.get("agency", "UNKNOWN")
+            year = row.get("year", "UNKNOWN")
+            format_type = row.get("Format_Type", "UNKNOWN")
+            stratobj = row.get("stratobj", "UNKNOWN")
+            obj = row.get("obj", "UNKNOWN")
+            goal = row.get("goal", "UNKNOWN")
+            label = f"{row.get('agency', 'UNKNOWN')} ({row.get('year', 'UNKNOWN')})"
+            logger.debug(f"Auditing line {i} of {total_rows}")
+
+            entry = {
+                "index": i+1, # Convert to 1-indexed for human readers
+                "agency_yr": agency_yr,
+                "agency": agency,
+                "year": int(year) if pd.notna(year) else "UNKNOWN",
+                "format_type": int(format_type) if pd.notna(format_type) else "UNKNOWN",
+                "stratobj": stratobj,
+                "obj": obj,
+                "goal": goal,
+                "label": label,
+                "tests": {},
+                "status": "PASS"
+            }
+
+            try:
+                if doc is None:
+                    raise doc_error
+                page_indices = mid_manager.parse_pdf_pages()
+                if mid_manager.page_field_error():
+                    entry["page_field_error"] = mid_manager.page_field_error()
+
+                for test_name, test_func in tests:
+                    try:
+                        passed = test_func(row, doc, page_indices, settings)
+                        entry["tests"][test_name] = "PASS" if passed else "FAIL"
+                        if not passed:
+                            entry["status"] = "FAIL"
+                            summary["test_failures"][test_name] = summary["test_failures"].get(test_name, 0) + 1
+                    except ScrapeTimeout as e:
+                        entry["tests"][test_name] = "TIMEOUT"
+                        summary["test_timeouts"][test_name] = summary["test_timeouts"].get(test_name, 0) + 1
+                        logger.warning(f"{test_name} TIMEOUT for {agency_yr}: {e}")
+                    except Exception as e:
+                        entry["tests"][test_name] = f"ERROR: {e}"
                         entry["status"] = "FAIL"
                         summary["test_failures"][test_name] = summary["test_failures"].get(test_name, 0) + 1
-                except Exception as e:
-                    entry["tests"][test_name] = f"ERROR: {e}"
-                    entry["status"] = "FAIL"
-                    summary["test_failures"][test_name] = summary["test_failures"].get(test_name, 0) + 1
-                    logger.warning(f"{test_name} ERROR for {agency_yr}: {e}")
+                        logger.warning(f"{test_name} ERROR for {agency_yr}: {e}")
+
+                # Record where failed match text actually appears in the document, if anywhere
+                if corpus_index is not None and corpus_index.is_indexed(agency_yr):
+                    for test_name, field in match_fields.items():
+                        if entry["tests"].get(test_name) != "FAIL":
+                            continue
+                        search_text = row.get(field, "").strip()
+                        if test_name == "goal_match":
+                            search_text = re.sub(r"\[.*?\]", "", search_text).strip()
+                        entry.setdefault("found_on_pages", {})[test_name] = corpus_index.find_pages(agency_yr, search_text)
+
+                # A row whose only problem is a timed-out scraper gets its own outcome rather than a FAIL
+                if entry["status"] == "PASS" and "TIMEOUT" in entry["tests"].values():
+                    entry["status"] = "TIMEOUT"
 
-        except Exception as e:
-            entry["status"] = "FAIL"
-            entry["tests"]["fatal"] = str(e)
-            logger.warning(f"AUDIT FATAL ERROR for {agency_yr}: {e}")
-            summary["test_failures"]["fatal"] = summary["test_failures"].get("fatal", 0) + 1
+            except Exception as e:
+                entry["status"] = "FAIL"
+                entry["tests"]["fatal"] = str(e)
+                logger.warning(f"AUDIT FATAL ERROR for {agency_yr}: {e}")
+                summary["test_failures"]["fatal"] = summary["test_failures"].get("fatal", 0) + 1
+
+            results.append(entry)
+
+            summary["status_counts"][entry["status"]] += 1
+
+            agency = entry["agency"]
+            year = str(entry["year"])
+            fmt = str(entry["format_type"])
+
+            failed_tests = [test for test, result in entry["tests"].items() if result == "FAIL" or result.startswith("ERROR")]
 
-        results.append(entry)
+            # Track outcomes by agency-year
+            if entry["status"] == "FAIL":
+                summary["failures_by_agency"].setdefault(agency, {})
+                summary["failures_by_agency"][agency].setdefault(year, [])
+                summary["failures_by_agency"][agency][year].extend(failed_tests)
 
-        summary["status_counts"][entry["status"]] += 1
+            # Outcomes by Format Type
+            outcome_bucket = summary["outcomes_by_format_type"].setdefault(str(fmt), {"PASS": 0, "FAIL": 0, "TIMEOUT": 0, "failed_tests": {}})
+            outcome_bucket[entry["status"]] += 1
+            for test in failed_tests:
+                outcome_bucket["failed_tests"][test] = outcome_bucket["failed_tests"].get(test, 0) + 1
 
-        agency = entry["agency"]
-        year = str(entry["year"])
-        fmt = str(entry["format_type"])
+            if on_result is not None:
+                on_result(entry, len(results), total_rows)
 
-        failed_tests = [test for test, result in entry["tests"].items() if result == "FAIL" or result.startswith("ERROR")]
+        if doc is not None:
+            doc.close()
+        if stopped:
+            break
 
-        # Track outcomes by agency-year
-        if entry["status"] == "FAIL":
-            summary["failures_by_agency"].setdefault(agency, {})
-            summary["failures_by_agency"][agency].setdefault(year, [])
-            summary["failures_by_agency"][agency][year].extend(failed_tests)
+    # Report rows in MID order, whatever order the documents were audited in
+    results.sort(key=lambda entry: entry["index"])
 
-        # Outcomes by Format Type
-        outcome_bucket = summary["outcomes_by_format_type"].setdefault(str(fmt), {"PASS": 0, "FAIL": 0, "failed_tests": {}})
-        outcome_bucket[entry["status"]] += 1
-        for test in failed_tests:
-            outcome_bucket["failed_tests"][test] = outcome_bucket["failed_tests"].get(test, 0) + 1
 
 
+    if corpus_index is not None:
+        corpus_index.close()
+    summary["rows_audited"] = len(results)
 
-    # Save Audit file to the logs directory
+    # Save Audit file to the logs directory. A stopped audit is saved next to the last complete
+    # report rather than over it.
     log_dir = settings.get("logFileDirectory", "./logs")
-    output_path = os.path.join(log_dir, "audit_report.json")
-    summary_path = os.path.join(log_dir, "audit_summary.json")
+    suffix = ".partial.json" if stopped else ".json"
+    output_path = os.path.join(log_dir, "audit_report" + suffix)
+    summary_path = os.path.join(log_dir, "audit_summary" + suffix)
 
     try:
         with open(output_path, "w", encoding="utf-8") as f:
@@ -309,7 +393,7 @@ def run_mid_audit(mid_manager, settings):
         with open(summary_path, "w", encoding="utf-8") as f:
             json.dump(summary, f, indent=2)
 
-        logger.info(f"Audit finished. Detailed report: {output_path}")
+        logger.info(f"Audit {'stopped' if stopped else 'finished'}. Detailed report: {output_path}")
         logger.info(f"Summary saved to: {summary_path}")
         return output_path
 
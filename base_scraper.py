@@ -14,7 +14,19 @@ from abc import ABC, abstractmethod
 #
 #########################################################
 #########################################################
+# Values for BaseScraper.cost_class, cheapest first
+COST_CLASSES = ("cheap", "moderate", "expensive")
+
+
 class BaseScraper(ABC):
+    # Optional capability declarations, read by the engines that schedule scraping work.
+    # The defaults are the cautious assumptions, so tools that declare nothing behave as before.
+    cost_class = "moderate"     # "cheap" (text layer), "moderate", or "expensive" (OCR, model inference)
+    thread_safe = False         # separate instances may scrape on several threads at once; PyMuPDF calls take image_utils.fitz_lock
+    process_safe = False        # can be loaded and run in a worker process from its source file
+    batchable = False           # scrape_batch() is overridden and does better than one job at a time
+    needs_models = False        # loads ML models at import, so worker processes are costly to start
+
     def __init__(self, pages, metadata=None):
         """
         Parameters:
@@ -30,6 +42,122 @@ class BaseScraper(ABC):
         """populates the output dictionary (self._output)"""
         pass
 
+    def iter_scrape(self, collect=True):
+        """
+        Optional streaming protocol: yields validated output one page at a time.
+        Each chunk follows the same schema as result, but covers a single page.
+        If collect is True the chunks are merged into self._output once the generator
+        is exhausted, so result keeps working afterwards.
+        Tools that don't override _scrape_chunk are scraped once for the whole document, as scrape()
+        always has, and that output is split into the chunks (see _split_output), so whole-document
+        values such as the status come out as scrape() gives them.
+        """
+        if type(self)._scrape_chunk is BaseScraper._scrape_chunk:
+            self.scrape()
+            yield from self._split_output(self._enforce_output_format(self._output))
+            return
+
+        chunks = []
+        for page_idx, page in enumerate(self.pages):
+            chunk = self._enforce_output_format(self._scrape_chunk(page_idx, page))
+            if collect:
+                chunks.append(chunk)
+            yield chunk
+        if collect:
+            self._output = self._merge_chunks(chunks)
+
+    def _scrape_chunk(self, page_idx, page):
+        """
+        Returns the output dictionary for a single page.
+        Override this if the tool can produce pages natively; iter_scrape then streams them as they are done.
+        """
+        raise NotImplementedError
+
+    def _split_output(self, output):
+        """
+        Splits a whole-document output into per-page chunks that _merge_chunks puts back together.
+        Lists with one item per page are split between the pages, other lists go with the first page,
+        and every other value (status, counts, ...) is repeated on each page.
+        """
+        page_count = len(self.pages)
+        chunks = []
+        for page_idx in range(page_count):
+            chunk = {}
+            for key, value in output.items():
+                if key == "text" and not isinstance(value, list):
+                    value = [value]
+                if not isinstance(value, list):
+                    chunk[key] = value
+                elif len(value) == page_count:
+                    chunk[key] = [value[page_idx]]
+                else:
+                    chunk[key] = list(value) if page_idx == 0 else []
+            chunks.append(chunk)
+        return chunks
+
+    @classmethod
+    def capabilities(cls):
+        """The tool's declared capabilities as a dictionary."""
+        return {
+            "cost_class": cls.cost_class,
+            "thread_safe": cls.thread_safe,
+            "process_safe": cls.process_safe,
+            "batchable": cls.batchable,
+            "needs_models": cls.needs_models,
+        }
+
+    @classmethod
+    def scrape_batch(cls, jobs, metadata=None):
+        """
+        Optional batch protocol: scrapes many jobs, each a (fitz.Document, [zero-indexed page numbers]) pair,
+        possibly from different documents. Returns one validated output dictionary per job, in order.
+        A job that fails gets an output with empty text and a "FATAL ERROR" status instead of stopping the batch.
+        The default scrapes the jobs one at a time; tools that can share work across jobs
+        (e.g. one model pass over many page images) override this and set batchable = True.
+        """
+        results = []
+        for doc, page_indices in jobs:
+            try:
+                scraper = cls([doc.load_page(p) for p in page_indices], metadata)
+                scraper.scrape()
+                results.append(scraper.result)
+            except Exception as e:
+                results.append({
+                    "page": [p + 1 for p in page_indices],
+                    "text": ["" for _ in page_indices],
+                    "status": f"FATAL ERROR: {e}",
+                    "method": cls.__name__,
+                })
+        return results
+
+    def load_chunks(self, chunks):
+        """
+        Sets the output from per-page chunks produced earlier, one per page in order
+        (e.g. read back from scrape_cache), without running the scraper.
+        """
+        self._output = self._merge_chunks([self._enforce_output_format(chunk) for chunk in chunks])
+
+    def _merge_chunks(self, chunks):
+        """Combines per-page chunks back into a single output dictionary."""
+        merged = {"page": [], "text": [], "method": self.__class__.__name__}
+        statuses = []
+        for chunk in chunks:
+            for key, value in chunk.items():
+                if key == "method":
+                    continue
+                elif key == "status":
+                    statuses.append(value)
+                elif key == "text":
+                    merged["text"].extend(value if isinstance(value, list) else [value])
+                elif isinstance(value, list):
+                    merged.setdefault(key, []).extend(value)
+                else:
+                    merged.setdefault(key, value)
+
+        # Identical per-page statuses collapse to one
+        merged["status"] = "; ".join(dict.fromkeys(statuses)) or "OK"
+        return merged
+
     @property
     def result(self):
         """returns validated output dict after running scrape()"""
@@ -0,0 +1,201 @@
+# corpus_extractor.py
+# Bulk text extraction for the whole PDF corpus.
+# Documents are spread across a process pool, each worker opening its own fitz handle, and the
+# results are streamed into a columnar store (one Parquet file per document) as they finish.
+# Other parts of the app read the precomputed text through PrecomputedText instead of calling
+# page.get_text again.
+
+import os
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import pandas as pd
+import fitz  # PyMuPDF
+from app_settings import load_settings
+from logger import setup_logger
+from corpus_search import doc_key
+
+
+MANIFEST_NAME = "manifest.json"
+STORE_COLUMNS = ["agency_yr", "page", "text", "char_count", "has_text_layer"]
+
+
+# Runs inside a worker process: open the document and pull the text of every page
+def _extract_document(path):
+    key = os.path.splitext(os.path.basename(path))[0]
+    columns = {name: [] for name in STORE_COLUMNS}
+    with fitz.open(path) as doc:
+        for page in doc:
+            text = page.get_text("text") or ""
+            columns["agency_yr"].append(key)
+            columns["page"].append(page.number + 1)  # 1-indexed, like scraper output
+            columns["text"].append(text)
+            columns["char_count"].append(len(text))
+            columns["has_text_layer"].append(bool(text.strip()))
+    return key, columns
+
+
+class CorpusExtractor:
+    def __init__(self, store_dir, workers=None):
+        self.logger = setup_logger()
+        self.store_dir = store_dir
+        self.workers = workers or os.cpu_count() or 1
+        os.makedirs(store_dir, exist_ok=True)
+        self.manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+        self.manifest = self._load_manifest()
+
+    @classmethod
+    def from_settings(cls, settings, workers=None):
+        return cls(settings.get("extractedTextDirectory", ""), workers)
+
+    def _load_manifest(self):
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Failed to read extraction manifest, re-extracting everything: {e}")
+            return {}
+
+    def _save_manifest(self):
+        # Write to a temp file first so an interrupted run never leaves a corrupt manifest
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def run(self, data_dir, force=False):
+        """
+        Extracts every new or modified PDF in data_dir into the store.
+
+        Returns:
+            dict with "documents", "pages", "failed", "seconds" and "pages_per_sec"
+        """
+        pending = []
+        for filename in sorted(os.listdir(data_dir)):
+            path = os.path.join(data_dir, filename)
+            if not (filename.lower().endswith(".pdf") and os.path.isfile(path)):
+                continue
+            stat = os.stat(path)
+            known = self.manifest.get(os.path.splitext(filename)[0], {})
+            if force or known.get("mtime") != stat.st_mtime or known.get("size") != stat.st_size:
+                pending.append(path)
+
+        stats = {"documents": 0, "pages": 0, "failed": 0, "seconds": 0.0, "pages_per_sec": 0.0}
+        if not pending:
+            self.logger.info("Extracted text store is up to date")
+            return stats
+
+        self.logger.info(f"Extracting text from {len(pending)} document(s) with {self.workers} worker(s)")
+        start = time.perf_counter()
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(_extract_document, path): path for path in pending}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    key, columns = future.result()
+                    self._write_document(key, path, columns)
+                except Exception as e:
+                    stats["failed"] += 1
+                    self.logger.warning(f"Text extraction failed for {path}: {e}")
+                    continue
+
+                stats["documents"] += 1
+                stats["pages"] += len(columns["page"])
+                elapsed = time.perf_counter() - start
+                self.logger.debug(
+                    f"Extracted {key} ({len(columns['page'])} pages) - "
+                    f"{stats['documents']}/{len(pending)} docs, {stats['pages'] / elapsed:.1f} pages/sec"
+                )
+
+        stats["seconds"] = time.perf_counter() - start
+        stats["pages_per_sec"] = stats["pages"] / stats["seconds"] if stats["seconds"] else 0.0
+        self.logger.info(
+            f"Extracted {stats['pages']:,} pages from {stats['documents']} document(s) in "
+            f"{stats['seconds']:.1f}s ({stats['pages_per_sec']:.1f} pages/sec), {stats['failed']} failed"
+        )
+        return stats
+
+    def _write_document(self, key, path, columns):
+        stat = os.stat(path)
+        pd.DataFrame(columns, columns=STORE_COLUMNS).to_parquet(
+            os.path.join(self.store_dir, f"{key}.parquet"), index=False
+        )
+        self.manifest[key] = {
+            "path": path,
+            "mtime": stat.st_mtime,
+            "size": stat.st_size,
+            "pages": len(columns["page"]),
+        }
+        self._save_manifest()
+
+
+class PrecomputedText:
+    """Read-only access to the extracted text store, with a small cache of loaded documents."""
+    def __init__(self, store_dir, max_documents=16):
+        self.store_dir = store_dir
+        self.max_documents = max_documents
+        self._documents = OrderedDict()
+        manifest_path = os.path.join(store_dir, MANIFEST_NAME)
+        if os.path.exists(manifest_path):
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {}
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get("extractedTextDirectory", ""))
+
+    def is_current(self, agency_yr, pdf_path):
+        """True if the store holds text for this document and the PDF has not changed since."""
+        known = self.manifest.get(doc_key(agency_yr))
+        if not known or not os.path.isfile(pdf_path):
+            return False
+        stat = os.stat(pdf_path)
+        return known["mtime"] == stat.st_mtime and known["size"] == stat.st_size
+
+    def _load(self, agency_yr):
+        key = doc_key(agency_yr)
+        if key in self._documents:
+            self._documents.move_to_end(key)
+            return self._documents[key]
+        if key not in self.manifest:
+            return None
+        texts = pd.read_parquet(
+            os.path.join(self.store_dir, f"{key}.parquet"), columns=["page", "text"]
+        ).sort_values("page")["text"].tolist()
+        self._documents[key] = texts
+        while len(self._documents) > self.max_documents:
+            self._documents.popitem(last=False)
+        return texts
+
+    def document_texts(self, agency_yr):
+        """Returns the text of every page (index 0 = page 1), or None if the document is not stored."""
+        return self._load(agency_yr)
+
+    def page_text(self, agency_yr, page_index):
+        """Returns the text of a zero-indexed page, or None if it is not stored."""
+        texts = self._load(agency_yr)
+        if texts is None or not 0 <= page_index < len(texts):
+            return None
+        return texts[page_index]
+
+
+# Refresh the extracted text store, then the full-text index from it: python corpus_extractor.py
+if __name__ == "__main__":
+    from corpus_search import CorpusSearchIndex
+
+    settings = load_settings()
+    data_dir = settings.get("dataDirectory", "")
+    print(CorpusExtractor.from_settings(settings).run(data_dir))
+
+    store = PrecomputedText.from_settings(settings)
+    index = CorpusSearchIndex.from_settings(settings)
+    try:
+        extract = lambda path: store.document_texts(os.path.splitext(os.path.basename(path))[0])
+        print(index.update(data_dir, extract_page_texts=extract))
+    finally:
+        index.close()
@@ -0,0 +1,193 @@
+# corpus_search.py
+# Persistent full-text search store over the PDF corpus.
+# Text is extracted from every PDF in the data directory once and stored in a local SQLite
+# database with an FTS5 index, keyed by document and page. Re-running update() only
+# re-extracts files that were added or changed since the last run.
+
+import os
+import sqlite3
+import time
+import fitz  # PyMuPDF
+from app_settings import load_settings
+from logger import setup_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    doc_key     TEXT PRIMARY KEY,
+    path        TEXT NOT NULL,
+    mtime       REAL NOT NULL,
+    size        INTEGER NOT NULL,
+    page_count  INTEGER NOT NULL,
+    indexed_at  REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    doc_key     TEXT NOT NULL,
+    page        INTEGER NOT NULL,
+    text        TEXT NOT NULL,
+    PRIMARY KEY (doc_key, page)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(
+    text, content='pages', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS pages_ai AFTER INSERT ON pages BEGIN
+    INSERT INTO pages_fts(rowid, text) VALUES (new.rowid, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS pages_ad AFTER DELETE ON pages BEGIN
+    INSERT INTO pages_fts(pages_fts, rowid, text) VALUES ('delete', old.rowid, old.text);
+END;
+"""
+
+
+# PDFs are named after their agency_yr with underscores (e.g. USDA_2002.pdf), normalize lookups to match
+def doc_key(agency_yr):
+    return str(agency_yr).strip().replace("-", "_")
+
+
+class CorpusSearchIndex:
+    def __init__(self, db_path):
+        self.logger = setup_logger()
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        self.conn = sqlite3.connect(db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @classmethod
+    def from_settings(cls, settings):
+        return cls(settings.get("corpusIndexPath", ""))
+
+    def close(self):
+        self.conn.close()
+
+    # ------------------------
+    # Ingestion
+    # ------------------------
+    def update(self, data_dir, extract_page_texts=None):
+        """
+        Incrementally indexes every PDF in data_dir.
+        New or modified files (by mtime and size) are re-extracted, removed files are dropped.
+
+        Parameters:
+            data_dir: directory containing the corpus PDFs
+            extract_page_texts: optional callable(path) -> list of page strings, used in place
+                                of opening the PDF with fitz (e.g. to reuse precomputed text).
+                                Returning None falls back to fitz for that file.
+
+        Returns:
+            dict of counts: {"indexed": n, "unchanged": n, "removed": n, "failed": n}
+        """
+        counts = {"indexed": 0, "unchanged": 0, "removed": 0, "failed": 0}
+        known = {
+            key: (mtime, size)
+            for key, mtime, size in self.conn.execute("SELECT doc_key, mtime, size FROM documents")
+        }
+
+        on_disk = {}
+        for filename in sorted(os.listdir(data_dir)):
+            path = os.path.join(data_dir, filename)
+            if filename.lower().endswith(".pdf") and os.path.isfile(path):
+                on_disk[os.path.splitext(filename)[0]] = path
+
+        start = time.perf_counter()
+        for key, path in on_disk.items():
+            stat = os.stat(path)
+            if known.get(key) == (stat.st_mtime, stat.st_size):
+                counts["unchanged"] += 1
+                continue
+            try:
+                page_texts = extract_page_texts(path) if extract_page_texts else None
+                if page_texts is None:
+                    page_texts = self._extract_page_texts(path)
+                self._store_document(key, path, stat, page_texts)
+                counts["indexed"] += 1
+                self.logger.debug(f"Indexed {len(page_texts)} pages from {path}")
+            except Exception as e:
+                counts["failed"] += 1
+                self.logger.warning(f"Failed to index {path}: {e}")
+
+        for key in set(known) - set(on_disk):
+            with self.conn:
+                self.conn.execute("DELETE FROM pages WHERE doc_key = ?", (key,))
+                self.conn.execute("DELETE FROM documents WHERE doc_key = ?", (key,))
+            counts["removed"] += 1
+
+        self.logger.info(f"Corpus index updated in {time.perf_counter() - start:.1f}s: {counts}")
+        return counts
+
+    def _extract_page_texts(self, path):
+        with fitz.open(path) as doc:
+            return [page.get_text("text") for page in doc]
+
+    def _store_document(self, key, path, stat, page_texts):
+        # Replace the document's pages in one transaction so readers never see a half-indexed file
+        with self.conn:
+            self.conn.execute("DELETE FROM pages WHERE doc_key = ?", (key,))
+            self.conn.executemany(
+                "INSERT INTO pages (doc_key, page, text) VALUES (?, ?, ?)",
+                ((key, page_num, text or "") for page_num, text in enumerate(page_texts, start=1))
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO documents (doc_key, path, mtime, size, page_count, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, path, stat.st_mtime, stat.st_size, len(page_texts), time.time())
+            )
+
+    # ------------------------
+    # Queries
+    # ------------------------
+    def is_indexed(self, agency_yr):
+        row = self.conn.execute("SELECT 1 FROM documents WHERE doc_key = ?", (doc_key(agency_yr),)).fetchone()
+        return row is not None
+
+    def page_text(self, agency_yr, page_number):
+        """Returns the stored text of a 1-indexed page, or None if it is not indexed."""
+        row = self.conn.execute(
+            "SELECT text FROM pages WHERE doc_key = ? AND page = ?", (doc_key(agency_yr), page_number)
+        ).fetchone()
+        return row[0] if row else None
+
+    def find_pages(self, agency_yr, phrase):
+        """
+        Returns the sorted 1-indexed pages of a document that contain phrase.
+        Matching is case-insensitive substring matching, like the audit tests, so a phrase may start
+        or end mid-word. The FTS index only matches whole tokens, so it isn't used here: the document's
+        pages are read through the primary key and each is checked directly.
+        """
+        phrase = str(phrase).strip()
+        if not phrase or not any(ch.isalnum() for ch in phrase):
+            return []
+        rows = self.conn.execute(
+            "SELECT page, text FROM pages WHERE doc_key = ?", (doc_key(agency_yr),)
+        ).fetchall()
+        needle = phrase.lower()
+        return sorted(page for page, text in rows if needle in text.lower())
+
+    def search(self, query, agency_yr=None, limit=50):
+        """
+        Full-text search across the corpus (or one document), best matches first.
+        query uses FTS5 syntax. Returns a list of (doc_key, page, snippet) tuples.
+        """
+        sql = """
+            SELECT pages.doc_key, pages.page, snippet(pages_fts, 0, '[', ']', '...', 12)
+            FROM pages_fts JOIN pages ON pages.rowid = pages_fts.rowid
+            WHERE pages_fts MATCH ?
+        """
+        params = [query]
+        if agency_yr is not None:
+            sql += " AND pages.doc_key = ?"
+            params.append(doc_key(agency_yr))
+        sql += " ORDER BY bm25(pages_fts) LIMIT ?"
+        params.append(limit)
+        return self.conn.execute(sql, params).fetchall()
+
+
+# Build or refresh the index from the command line: python corpus_search.py
+if __name__ == "__main__":
+    settings = load_settings()
+    index = CorpusSearchIndex.from_settings(settings)
+    try:
+        print(index.update(settings.get("dataDirectory", "")))
+    finally:
+        index.close()
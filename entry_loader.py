@@ -0,0 +1,147 @@
+# entry_loader.py
+# Loading one MID entry for review: open its PDF, scrape the listed pages and pre-render them.
+# Nothing in here touches Qt, so the same steps can run on the UI thread or in background
+# workers (see entry_prefetcher.py).
+
+import os
+import fitz  # PyMuPDF
+from logger import setup_logger
+from scraper_loader import select_scraper_class
+from image_utils import render_page, resolve_scale, fitz_lock
+from scrape_cache import get_scrape_cache, iter_cached_scrape
+from scraper_pool import get_scraper_pool
+
+
+# Format types whose scraped content is displayed in the structured table viewer
+TABLE_VIEW_FORMATS = [1, 5, 6, 7, 10, 11, 14, 16, 17, 18]
+
+# Scale pages are pre-rendered at when the viewer size is unknown
+DISPLAY_SCALE = 2.0
+
+
+# Raised when a MID entry can't be loaded at all (missing file, no pages...)
+class EntryLoadError(Exception):
+    pass
+
+
+def open_mid_entry(row, page_indices, settings):
+    """
+    Resolves and opens the document for a MID row.
+
+    Parameters:
+        row: MID row (anything with .get, e.g. a MIDRow or pandas Series)
+        page_indices: zero-indexed pages parsed from the row's "PDF Page Number" field
+        settings: application settings dictionary
+
+    Returns:
+        entry dictionary, with empty page_text_cache and page_tables_cache lists ready to be filled by scrape_mid_entry()
+    """
+    agency = row.get("agency", "UNKNOWN").strip()
+    year = str(row.get("year", "UNKNOWN")).strip()
+    agency_yr = row.get("agency_yr", "").strip()
+    label = f"{agency} ({year})"
+
+    if not agency_yr:
+        raise EntryLoadError(f"MID row missing 'agency_yr' for {label}")
+
+    # Handle any hyphen-underscore mixups
+    filename = f"{agency_yr.replace('-','_')}.pdf"
+    path = os.path.join(settings.get("dataDirectory", ""), filename)
+    if not os.path.isfile(path):
+        raise EntryLoadError(f"PDF not found for MID row {label} - expected file: {filename}")
+
+    if not page_indices:
+        raise EntryLoadError(f"No valid pages found for {label} - PDF Page number field: '{row.get('PDF Page Number', '')}' ")
+
+    # A blank Format_Type is pd.NA after the MID's Int64 cast
+    try:
+        format_type = int(row.get("Format_Type", -1))
+    except (TypeError, ValueError):
+        raise EntryLoadError(f"Missing or invalid Format_Type for {label}: '{row.get('Format_Type', '')}'")
+
+    try:
+        with fitz_lock:
+            doc = fitz.open(path)
+    except Exception as e:
+        raise EntryLoadError(f"Error loading {filename} for {label}: {e}")
+
+    return {
+        "agency_yr": agency_yr,
+        "label": label,
+        "path": path,
+        "doc": doc,
+        "page_indices": list(page_indices),
+        "format_type": format_type,
+        "use_table_view": format_type in TABLE_VIEW_FORMATS,
+        "page_text_cache": [""] * len(page_indices),
+        "page_tables_cache": [[] for _ in page_indices],   # TableScraper table records per page
+        "scraped": False,
+    }
+
+
+def scrape_mid_entry(entry, settings, cancel_event=None):
+    """
+    Runs the scraper selected for the entry's format type, streaming page by page.
+    Pages already in the scrape cache are read from it instead of being scraped again.
+    Fills entry["page_text_cache"] and entry["page_tables_cache"] as it goes and yields
+    (page_idx, text, tables) for each page; tables is empty for scrapers without table output.
+    Stops early, leaving entry["scraped"] False, if cancel_event is set.
+    Scraper errors are logged and stored in entry["error"] rather than raised.
+    """
+    logger = setup_logger()
+    label = entry["label"]
+    try:
+        ScraperClass = select_scraper_class(settings, entry["format_type"])
+        with fitz_lock:
+            pages = [entry["doc"].load_page(p) for p in entry["page_indices"]]
+        Scraper = ScraperClass(pages)
+
+        pages_scraped = 0
+        for page_idx, chunk in iter_cached_scrape(Scraper, get_scrape_cache(settings), get_scraper_pool(settings)):
+            if cancel_event is not None and cancel_event.is_set():
+                logger.debug(f"Scrape of {label} cancelled after {pages_scraped} page(s)")
+                return
+            text_result = chunk.get("text", [])
+            if not isinstance(text_result, list):
+                raise ValueError("Expected a list of strings from the Scraper!")
+
+            entry["page_text_cache"][page_idx] = text_result[0] if text_result else ""
+            entry["page_tables_cache"][page_idx] = chunk.get("tables", [])
+            pages_scraped += 1
+            yield page_idx, entry["page_text_cache"][page_idx], entry["page_tables_cache"][page_idx]
+
+        if pages_scraped != len(entry["page_indices"]):
+            logger.warning(f"Scraper returned {pages_scraped} pages, expected {len(entry['page_indices'])}")
+
+        logger.info(f"Scraped {pages_scraped} pages from {label}")
+
+    except Exception as e:
+        logger.error(f"Failed to scrape all pages for {label}: {e}")
+        entry["error"] = str(e)
+
+    # Scrape failures still count as done: the entry is displayed with whatever text was recovered
+    entry["scraped"] = True
+
+
+def prerender_mid_entry(entry, render_size=None, cancel_event=None):
+    """
+    Renders the entry's pages into the shared render cache so displaying them is instant.
+    render_size is the viewer's pixel box; pages are fitted to it exactly as the viewer does,
+    so its renders hit the cache.
+    """
+    for page_num in entry["page_indices"]:
+        if cancel_event is not None and cancel_event.is_set():
+            return
+        with fitz_lock:
+            page = entry["doc"].load_page(page_num)
+        scale = resolve_scale(page, size=render_size) if render_size else DISPLAY_SCALE
+        render_page(page, scale=scale)
+
+
+def load_mid_entry(row, page_indices, settings, cancel_event=None, render_size=None):
+    """Opens, scrapes and pre-renders an entry in one go. Raises EntryLoadError if it can't be opened."""
+    entry = open_mid_entry(row, page_indices, settings)
+    for _ in scrape_mid_entry(entry, settings, cancel_event):
+        pass
+    prerender_mid_entry(entry, render_size, cancel_event)
+    return entry
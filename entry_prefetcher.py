@@ -0,0 +1,143 @@
+# entry_prefetcher.py
+# Background prefetching of upcoming MID entries for the review app.
+# While the reviewer looks at one entry, the next few in the review direction are opened,
+# scraped and pre-rendered on a QThreadPool, so moving to them is usually instant.
+
+import threading
+from collections import OrderedDict
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from logger import setup_logger
+from image_utils import fitz_lock
+from entry_loader import load_mid_entry, EntryLoadError
+
+
+class _PrefetchSignals(QObject):
+    # task, result: a loaded entry dictionary, an EntryLoadError, or None if cancelled before starting
+    done = pyqtSignal(object, object)
+
+
+class _PrefetchTask(QRunnable):
+    def __init__(self, row_index, row, page_indices, settings, render_size, signals):
+        super().__init__()
+        self.setAutoDelete(False)  # the prefetcher keeps a reference so it can be cancelled
+        self.row_index = row_index
+        self.row = row
+        self.page_indices = page_indices
+        self.settings = settings
+        self.render_size = render_size
+        self.signals = signals
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        result = None
+        if not self.cancel_event.is_set():
+            try:
+                result = load_mid_entry(
+                    self.row, self.page_indices, self.settings, self.cancel_event, self.render_size
+                )
+            except EntryLoadError as e:
+                result = e
+            except Exception as e:
+                result = EntryLoadError(f"Prefetch failed: {e}")
+        # Always report back, even when cancelled, so the prefetcher can release the task
+        self.signals.done.emit(self, result)
+
+
+class EntryPrefetcher(QObject):
+    def __init__(self, settings, depth=3, max_cached=6, parent=None):
+        """
+        Parameters:
+            settings: application settings dictionary
+            depth: number of entries ahead of the current one to prefetch
+            max_cached: maximum number of loaded entries kept; the oldest are closed first
+        """
+        super().__init__(parent)
+        self.logger = setup_logger()
+        self.settings = settings
+        self.depth = depth
+        self.max_cached = max(max_cached, depth)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)  # one background document at a time, keeps the UI responsive
+        self.signals = _PrefetchSignals()
+        self.signals.done.connect(self._on_done)
+        self._tasks = {}                # row index -> in-flight _PrefetchTask
+        self._cancelled = set()         # cancelled tasks still running, kept alive until they report back
+        self._cache = OrderedDict()     # row index -> entry dictionary or EntryLoadError
+
+    def update_settings(self, settings, depth=None):
+        self.settings = settings
+        if depth is not None:
+            self.depth = depth
+            self.max_cached = max(self.max_cached, depth)
+        self.clear()
+
+    def prefetch(self, mid_manager, direction="next", render_size=None, next_index=None):
+        """
+        Schedules the next `depth` rows after the current one in the review direction.
+        render_size is the page viewer's pixel box, so pages are pre-rendered at the size it will ask for.
+        next_index(direction, index) picks the row after index; it defaults to the MID's next valid row.
+        In-flight work for rows outside that window is cancelled, e.g. after the reviewer jumps.
+        """
+        # Rows the validity index rules out are never prefetched, the reviewer will jump over them
+        next_index = next_index or mid_manager.next_valid_index
+        wanted = []
+        index = next_index(direction, mid_manager.current_index)
+        while len(wanted) < self.depth and index is not None:
+            wanted.append(index)
+            index = next_index(direction, index)
+
+        for index in list(self._tasks):
+            if index not in wanted:
+                self._cancel(index)
+
+        for index in wanted:
+            if index in self._cache or index in self._tasks:
+                continue
+            row = mid_manager.row(index)
+            page_indices = mid_manager.parse_pdf_pages(index)
+            task = _PrefetchTask(index, row, page_indices, self.settings, render_size, self.signals)
+            self._tasks[index] = task
+            self.pool.start(task)
+        self.logger.debug(f"Prefetching MID rows {wanted}")
+
+    def take(self, index):
+        """
+        Returns the prefetched result for a row and removes it from the cache:
+        a loaded entry dictionary, an EntryLoadError, or None if it isn't ready.
+        """
+        return self._cache.pop(index, None)
+
+    def clear(self):
+        """Cancels all work and drops every cached entry (row indices are about to change meaning)."""
+        for index in list(self._tasks):
+            self._cancel(index)
+        while self._cache:
+            self._close(self._cache.popitem(last=False)[1])
+
+    def _cancel(self, index):
+        task = self._tasks.pop(index)
+        task.cancel_event.set()
+        if not self.pool.tryTake(task):
+            self._cancelled.add(task)
+
+    def _on_done(self, task, result):
+        # Ignore results from tasks that were cancelled while they were running
+        if task.cancel_event.is_set():
+            self._cancelled.discard(task)
+            self._close(result)
+            return
+        index = task.row_index
+        del self._tasks[index]
+
+        self._cache[index] = result
+        while len(self._cache) > self.max_cached:
+            self._close(self._cache.popitem(last=False)[1])
+        if isinstance(result, EntryLoadError):
+            self.logger.debug(f"Prefetch found MID row {index} invalid: {result}")
+        else:
+            self.logger.debug(f"Prefetched MID row {index} ({result['label']})")
+
+    def _close(self, result):
+        if isinstance(result, dict):
+            with fitz_lock:
+                result["doc"].close()
@@ -1,20 +1,171 @@
 # image_utils.py
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
 import fitz  # PyMuPDF
 from PIL import Image
 import io
 
-def pdf_page_to_pil(page, scale=2.0):
+DEFAULT_RENDER_CACHE_MB = 256
+
+# PyMuPDF is not thread-safe. The review app opens, scrapes and renders documents on the UI thread
+# and on background thread pools, so every fitz call made from those threads holds this lock.
+# It is re-entrant, so a locked scrape can still call render_page.
+fitz_lock = threading.RLock()
+
+COLORSPACES = {
+    "RGB": fitz.csRGB,
+    "GRAY": fitz.csGRAY,
+}
+
+def document_key(doc):
+    """
+    Returns a hashable identity for an open fitz.Document, used to key per-page caches.
+    Documents opened from the same file share a key, which changes if the file is modified.
+    In-memory documents fall back to the object id.
+    """
+    if doc.name and os.path.isfile(doc.name):
+        path = os.path.abspath(doc.name)
+        return (path, os.path.getmtime(path))
+    return ("memory", id(doc))
+
+
+class RenderCache:
+    """
+    Thread-safe LRU cache of rendered fitz.Pixmaps, bounded by the total size of the bitmaps.
+    Shared by the GUI and the scrapers so each page is rasterized once per session.
+    """
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pix = self._entries.get(key)
+            if pix is not None:
+                self._entries.move_to_end(key)
+            return pix
+
+    def put(self, key, pix):
+        size = pix.stride * pix.height
+        with self._lock:
+            if key in self._entries:
+                old = self._entries.pop(key)
+                self._bytes -= old.stride * old.height
+            # Bitmaps larger than the whole budget are returned to the caller but never cached
+            if size > self.max_bytes:
+                return
+            self._entries[key] = pix
+            self._bytes += size
+            self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= old.stride * old.height
+
+# Process-wide cache used by default
+render_cache = RenderCache(DEFAULT_RENDER_CACHE_MB * 1024 * 1024)
+
+
+def resolve_scale(page, scale=2.0, dpi=None, size=None, clip=None):
     """
-    Converts a fitz.Page (PyMuPDF) object to a PIL image.
-    
+    Works out the zoom factor for a render request. Precedence: size, then dpi, then scale.
+
+    Parameters:
+        page: fitz.Page object
+        scale: float scaling factor, used when neither dpi nor size is given
+        dpi: target resolution in dots per inch (PDF space is 72 dpi)
+        size: (width, height) in pixels; the area is fit inside it, keeping the aspect ratio
+        clip: optional fitz.Rect, the area being rendered (defaults to the whole page)
+    """
+    if size is not None:
+        area = fitz.Rect(clip) if clip is not None else page.rect
+        if area.is_empty:
+            return scale
+        return min(size[0] / area.width, size[1] / area.height)
+    if dpi is not None:
+        return dpi / 72.0
+    return scale
+
+def render_page(page, scale=2.0, colorspace="RGB", clip=None, alpha=False, cache=render_cache):
+    """
+    Rasterizes a fitz.Page, reusing a cached pixmap when the same render was done before.
+    All options are passed straight to page.get_pixmap, so a clipped or grayscale render
+    only costs the pixels it produces.
+
+    Parameters:
+        page: fitz.Page object
+        scale: float scaling factor (e.g., 2.0 for 2x zoom)
+        colorspace: "RGB" or "GRAY"
+        clip: optional fitz.Rect (PDF coordinates) to render only part of the page
+        alpha: include an alpha channel (off by default, scrapers and the viewer don't need one)
+        cache: RenderCache to use, or None to bypass caching
+
+    Returns:
+        fitz.Pixmap. Treat it as read-only, it may be shared.
+    """
+    if colorspace not in COLORSPACES:
+        raise ValueError(f"Unsupported colorspace '{colorspace}', expected one of {list(COLORSPACES)}")
+    key = (
+        document_key(page.parent), page.number, float(scale), colorspace, bool(alpha),
+        tuple(fitz.Rect(clip)) if clip is not None else None
+    )
+    pix = cache.get(key) if cache is not None else None
+    if pix is None:
+        with fitz_lock:
+            pix = page.get_pixmap(
+                matrix=fitz.Matrix(scale, scale), colorspace=COLORSPACES[colorspace], clip=clip, alpha=alpha
+            )
+        if cache is not None:
+            cache.put(key, pix)
+    return pix
+
+def pixmap_to_pil(pix):
+    """
+    Copies a pixmap's samples into a PIL image, in one pass and without an intermediate bytes object.
+    The image owns its pixels, so the pixmap can be evicted from the render cache while it is in use.
+    """
+    mode = {1: "L", 2: "LA", 3: "RGB", 4: "RGBA"}[pix.n]
+    with fitz_lock:
+        return Image.frombytes(mode, (pix.width, pix.height), pix.samples_mv, "raw", mode, pix.stride, 1)
+
+def pixmap_to_numpy(pix):
+    """
+    Returns a read-only (height, width, channels) uint8 view of a pixmap's samples, without copying.
+    The array shares the pixmap's memory, so keep the pixmap referenced while using it.
+    """
+    buffer = np.frombuffer(pix.samples_mv, dtype=np.uint8)
+    return buffer.reshape(pix.height, pix.stride)[:, :pix.width * pix.n].reshape(pix.height, pix.width, pix.n)
+
+def pdf_page_to_pil(page, scale=2.0, clip=None, dpi=None, size=None, colorspace="RGB", alpha=False):
+    """
+    Converts a fitz.Page (PyMuPDF) object, or a region of it, to a PIL image.
+
     Parameters:
         page: fitz.Page object
         scale: float scaling factor (e.g., 2.0 for 2x zoom)
+        clip: optional fitz.Rect (PDF coordinates) to render only that region
+        dpi: optional target resolution, overrides scale
+        size: optional (width, height) pixel box to fit the render into, overrides dpi and scale
+        colorspace: "RGB" or "GRAY" (PIL mode "L")
+        alpha: include an alpha channel (PIL mode "RGBA")
 
     Returns:
         PIL.Image.Image object
     """
-    matrix = fitz.Matrix(scale, scale)
-    pix = page.get_pixmap(matrix=matrix)
-    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-    return img
+    scale = resolve_scale(page, scale, dpi, size, clip)
+    return pixmap_to_pil(render_page(page, scale, colorspace=colorspace, clip=clip, alpha=alpha))
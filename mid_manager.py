@@ -1,7 +1,15 @@
 # mid_manager.py
 
-import pandas as pd
+import os
 import re
+import json
+import time
+import hashlib
+from bisect import bisect_left, bisect_right
+import numpy as np
+import pandas as pd
+import openpyxl
+import fitz  # PyMuPDF
 from logger import setup_logger
 
 
@@ -33,87 +41,529 @@ COLUMN_TYPES = {
     "Format_Type": int
 }
 
+# Low-cardinality text columns stored as pandas categoricals
+CATEGORY_COLUMNS = ["agency", "Format"]
+
+# Rows read from the workbook per chunk; only one chunk of raw cell values is held in memory at a time
+LOAD_CHUNK_ROWS = 5000
+
+# Columns with a hash index (value -> row ids), see MIDManager.rows_where()
+INDEXED_COLUMNS = {
+    "agency_yr": "agency_yr",
+    "agency": "agency",
+    "year": "year",
+    "format_type": "Format_Type",
+}
+
+# Columns added at load time holding each row's parsed "PDF Page Number" field
+PAGES_COLUMN = "pdf_pages"              # sorted zero-indexed pages
+PAGE_ERROR_COLUMN = "pdf_page_error"    # why (part of) the field couldn't be parsed, "" if it parsed cleanly
+
+# Parts of a page field: "p.3", "5-7", "p.5 - p.7"; anything else is reported as malformed
+_PAGE_PREFIX = re.compile(r"p\.\s*")
+_PAGE_RANGE_DASH = re.compile(r"\s*-\s*")
+_PAGE_SEPARATOR = re.compile(r"[,\s]+")
+_PAGE_PART = re.compile(r"(\d+)(?:-(\d+))?")
+
+# Bump when load_mid's output changes (columns, types, cleaning) so existing snapshots are rebuilt
+SNAPSHOT_VERSION = 2
+
+
+def snapshot_paths(path, sheet_name):
+    """Returns (data path, key path) of the Parquet snapshot kept next to a MID workbook for one sheet."""
+    folder, filename = os.path.split(os.path.abspath(path))
+    sheet = re.sub(r"[^\w.-]", "_", str(sheet_name))
+    stem = os.path.join(folder, f".{filename}.{sheet}.snapshot")
+    return f"{stem}.parquet", f"{stem}.json"
+
+def parse_page_field(page_field):
+    """
+    Parses a "PDF Page Number" field like "p.3, p.5-7" into (sorted zero-indexed pages, error).
+    Ranges are inclusive. error is "" for a clean field; a field with a bad range yields no pages,
+    other unrecognised parts are skipped and reported.
+    """
+    page_field = str(page_field).strip()
+    if not page_field or page_field.lower() == "nan":
+        return [], "empty page field"
+    page_field = _PAGE_PREFIX.sub("", page_field.lower())
+    page_field = _PAGE_RANGE_DASH.sub("-", page_field)
+
+    pages = set()
+    ignored = []
+    for part in _PAGE_SEPARATOR.split(page_field):
+        if not part:
+            continue
+        match = _PAGE_PART.fullmatch(part)
+        if match is None:
+            if "-" in part:
+                return [], f"unparseable range '{part}'"
+            ignored.append(part)
+            continue
+        start = int(match.group(1))
+        end = int(match.group(2)) if match.group(2) else start
+        pages.update(range(start - 1, end))
+    pages = sorted(p for p in pages if p >= 0)
+
+    if ignored:
+        return pages, f"ignored {', '.join(repr(p) for p in ignored)}"
+    if not pages:
+        return pages, "no pages listed"
+    return pages, ""
+
+def _cell_text(value):
+    """Text of a cell the way pd.read_excel(dtype=str) reports it; whole-number floats lose their ".0"."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class MIDRow:
+    """
+    One MID row, read like the pandas Series it replaces: row["agency"], row.get("year", default), "goal" in row.
+    Rows are built once when the MID loads; missing Int64 values are pd.NA.
+    """
+    __slots__ = ("row_id", "_columns", "_values")
+
+    def __init__(self, row_id, columns, values):
+        self.row_id = row_id        # position in the full MID
+        self._columns = columns     # column name -> position in values, shared by every row of a MID
+        self._values = values
+
+    def __getitem__(self, column):
+        return self._values[self._columns[column]]
+
+    def __contains__(self, column):
+        return column in self._columns
+
+    def get(self, column, default=None):
+        position = self._columns.get(column)
+        return default if position is None else self._values[position]
+
+    def to_dict(self):
+        return dict(zip(self._columns, self._values))
+
+
+def build_rows(df):
+    """Builds a MIDRow per row of a DataFrame, reading each column once as a whole."""
+    columns = {column: position for position, column in enumerate(df.columns)}
+    arrays = [df[column].tolist() for column in df.columns]
+    return [MIDRow(row_id, columns, values) for row_id, values in enumerate(zip(*arrays))]
+
+
 class MIDManager:
-    def __init__(self, path, sheet_name=0):
+    def __init__(self, path=None, sheet_name=0, data_dir=None, df=None):
+        """
+        Loads the MID from path, or wraps an already-loaded DataFrame (df), e.g. one handed to a worker process.
+        If data_dir is given the validity index is built straight away.
+        """
         self.logger = setup_logger()
-        self.df = self.load_mid(path, sheet_name)
+        self.df = df if df is not None else self.load_mid(path, sheet_name)
+        if PAGES_COLUMN not in self.df.columns:
+            self.parse_page_column(self.df)
+        self.source_df = self.df        # The full MID; audit row numbers and restrict_to_rows refer to it
+        self.rows = build_rows(self.df)
+        self.indexes = self.build_indexes(self.df)
+        # Rows under review: positions in the full MID, or None for all of them (see restrict_to_rows).
+        # Row indices everywhere else (current_index, the validity index) count within this view.
+        self.view = None
         self.current_index = 0
+
+        # Validity index, see build_validity_index()
+        self.data_dir = None
+        self.valid_rows = None          # Sorted row indices that can be reviewed, None until built
+        self.skip_reasons = {}          # Row index -> why it can't be reviewed
+        self._page_counts = {}          # absolute PDF path -> page count (None if missing), shared across rebuilds
+
+        if data_dir is not None:
+            self.build_validity_index(data_dir)
         self.logger.info("Initialized MIDManager")
 
     def load_mid(self, path, sheet_name=0):
-        """Loads and validates the Master Input Document (MID) Excel file."""
+        """
+        Loads and validates the Master Input Document (MID) Excel file.
+        The validated DataFrame is kept in a Parquet snapshot next to the workbook and reused until
+        the workbook changes, so only the first load pays for the Excel parse.
+        """
+        df = self.read_snapshot(path, sheet_name)
+        if df is not None:
+            return df
+        start = time.perf_counter()
+        df = self.parse_mid(path, sheet_name)
+        self.logger.info(f"Parsed MID {path} ({len(df):,} rows) in {time.perf_counter() - start:.2f}s")
+        self.write_snapshot(df, path, sheet_name)
+        return df
+
+    # Snapshot key: the workbook is considered unchanged if its size and mtime match,
+    # or failing that (e.g. it was copied or touched) if its contents hash the same
+    def _snapshot_key(self, path, sheet_name, with_hash=False):
+        stat = os.stat(path)
+        key = {
+            "version": SNAPSHOT_VERSION, "sheet": str(sheet_name),
+            "size": stat.st_size, "mtime_ns": stat.st_mtime_ns
+        }
+        if with_hash:
+            key["sha256"] = _file_hash(path)
+        return key
+
+    def read_snapshot(self, path, sheet_name=0):
+        """Returns the snapshotted MID if it is still current for the workbook, otherwise None."""
+        data_path, key_path = snapshot_paths(path, sheet_name)
+        if not (os.path.isfile(data_path) and os.path.isfile(key_path)):
+            return None
         try:
-            df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)  # Read all as string first
+            with open(key_path, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            current = self._snapshot_key(path, sheet_name)
+            if saved.get("version") != SNAPSHOT_VERSION or saved.get("sheet") != current["sheet"]:
+                return None
+            if (saved.get("size"), saved.get("mtime_ns")) != (current["size"], current["mtime_ns"]):
+                if saved.get("size") != current["size"] or saved.get("sha256") != _file_hash(path):
+                    self.logger.info(f"MID {path} changed since its snapshot was taken")
+                    return None
+                # Same contents, new mtime: refresh the key so the hash isn't needed next time
+                self._write_snapshot_key(key_path, self._snapshot_key(path, sheet_name, with_hash=True))
+
+            start = time.perf_counter()
+            df = pd.read_parquet(data_path)
+            missing = [col for col in EXPECTED_COLUMNS if col not in df.columns]
+            if missing:
+                self.logger.warning(f"MID snapshot {data_path} is missing columns {missing}, ignoring it")
+                return None
+            self.logger.info(f"Loaded MID snapshot {data_path} ({len(df):,} rows) in {time.perf_counter() - start:.3f}s")
+            return df
         except Exception as e:
-            raise RuntimeError(f"Failed to load MID file: {e}")
+            self.logger.warning(f"Could not read MID snapshot {data_path}, parsing the workbook instead: {e}")
+            return None
+
+    def write_snapshot(self, df, path, sheet_name=0):
+        """Saves a validated MID next to its workbook. Failing to write it only costs a slower next start."""
+        data_path, key_path = snapshot_paths(path, sheet_name)
+        try:
+            key = self._snapshot_key(path, sheet_name, with_hash=True)
+            # Data first, key last: a key only ever describes a complete snapshot
+            if os.path.exists(key_path):
+                os.remove(key_path)
+            temp_path = f"{data_path}.tmp"
+            df.to_parquet(temp_path, index=False)
+            os.replace(temp_path, data_path)
+            self._write_snapshot_key(key_path, key)
+            self.logger.info(f"Saved MID snapshot {data_path}")
+        except Exception as e:
+            self.logger.warning(f"Could not save MID snapshot {data_path}: {e}")
 
-        missing = [col for col in EXPECTED_COLUMNS if col not in df.columns]
+    def _write_snapshot_key(self, key_path, key):
+        temp_path = f"{key_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(key, f)
+        os.replace(temp_path, key_path)
+
+    def parse_mid(self, path, sheet_name=0):
+        """
+        Reads the MID straight from the Excel workbook, validating and casting its columns.
+        .xlsx/.xlsm sheets are streamed in LOAD_CHUNK_ROWS chunks, each cast to compact types as soon as it is read.
+        """
+        if os.path.splitext(path)[1].lower() in (".xlsx", ".xlsm"):
+            chunks = [self._cast_chunk(chunk, lines) for chunk, lines in self._read_xlsx_chunks(path, sheet_name)]
+        else:
+            try:
+                df = pd.read_excel(path, sheet_name=sheet_name, dtype=str)  # Read all as string first
+            except Exception as e:
+                raise RuntimeError(f"Failed to load MID file: {e}")
+            self._check_columns(df.columns)
+            chunks = [self._cast_chunk(df.fillna(""), range(2, len(df) + 2))]
+
+        # Chunks only share a categorical dtype once their categories match
+        for col in CATEGORY_COLUMNS:
+            categories = sorted(set().union(*(chunk[col].cat.categories for chunk in chunks)))
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+        return pd.concat(chunks, ignore_index=True)
+
+    def _check_columns(self, columns):
+        missing = [col for col in EXPECTED_COLUMNS if col not in columns]
         if missing:
             raise ValueError(f"MID file is missing required columns: {missing}")
 
-        # Cast columns to correct types
-        for col, col_type in COLUMN_TYPES.items():
-            if col in df.columns:
-                try:
-                    if col_type is int:
-                        df[col] = pd.to_numeric(df[col], errors="coerce").astype("Int64")
-                    else:
-                        df[col] = df[col].fillna("").astype(str).str.strip()
-                except Exception as e:
-                    raise ValueError(f"Failed to cast column '{col}' to {col_type}: {e}")
+    # Stream the sheet with openpyxl's read-only mode, yielding (DataFrame of cell text, Excel line of each row).
+    # Blank rows are skipped, as pd.read_excel does.
+    def _read_xlsx_chunks(self, path, sheet_name):
+        try:
+            workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        except Exception as e:
+            raise RuntimeError(f"Failed to load MID file: {e}")
+
+        try:
+            sheet = workbook.worksheets[sheet_name] if isinstance(sheet_name, int) else workbook[sheet_name]
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None) or ()
+            columns = [str(name) if name is not None else f"Unnamed: {i}" for i, name in enumerate(header)]
+            self._check_columns(columns)
 
+            width = len(columns)
+            chunk, lines = [], []
+            chunks_read = 0
+            for line, values in enumerate(rows, start=2):
+                values = values[:width]
+                if all(value is None for value in values):
+                    continue
+                chunk.append([_cell_text(value) for value in values] + [""] * (width - len(values)))
+                lines.append(line)
+                if len(chunk) >= LOAD_CHUNK_ROWS:
+                    yield pd.DataFrame(chunk, columns=columns), lines
+                    chunk, lines = [], []
+                    chunks_read += 1
+            # Always at least one chunk, so a sheet with only a header still has its columns
+            if chunk or not chunks_read:
+                yield pd.DataFrame(chunk, columns=columns), lines
+        except Exception as e:
+            if isinstance(e, ValueError):
+                raise
+            raise RuntimeError(f"Failed to load MID file: {e}")
+        finally:
+            workbook.close()
+
+    # Cast one chunk of cell text to COLUMN_TYPES, reporting values that aren't valid for their column
+    def _cast_chunk(self, df, lines):
+        for col, col_type in COLUMN_TYPES.items():
+            try:
+                text = df[col].astype(str).str.strip()
+                if col_type is int:
+                    numbers = pd.to_numeric(text, errors="coerce")
+                    invalid = (numbers.isna() & (text != "")).to_numpy().nonzero()[0]
+                    if len(invalid):
+                        self.logger.warning(
+                            f"MID column '{col}' has {len(invalid):,} non-numeric value(s), left blank: "
+                            + ", ".join(f"line {lines[i]} '{text.iat[i]}'" for i in invalid[:10])
+                            + (" ..." if len(invalid) > 10 else "")
+                        )
+                    df[col] = numbers.astype("Int64")
+                elif col in CATEGORY_COLUMNS:
+                    df[col] = text.astype("category")
+                else:
+                    df[col] = text
+            except Exception as e:
+                raise ValueError(f"Failed to cast column '{col}' to {col_type}: {e}")
         return df
 
+    def __len__(self):
+        return len(self.rows) if self.view is None else len(self.view)
+
+    def source_index(self, index):
+        """Position in the full MID of a row in the current view."""
+        return index if self.view is None else self.view[index]
+
+    def row(self, index):
+        return self.rows[self.source_index(index)]
+
     def get_current_row(self):
-        if self.df is not None and 0 <= self.current_index < len(self.df):
-            return self.df.iloc[self.current_index]
+        if 0 <= self.current_index < len(self):
+            return self.row(self.current_index)
         else:
             return None
 
     # Allow next_ and prev_mid_entry to run over by 1 so that get_current_row can return None when the end is reached
     def next_mid_entry(self):
-        if self.df is not None and self.current_index < len(self.df):
+        if self.current_index < len(self):
             self.current_index += 1
 
     def prev_mid_entry(self):
-        if self.df is not None and self.current_index >= 0:
+        if self.current_index >= 0:
             self.current_index -= 1
 
-    # Parse the 'PDF Page Number' field into a list of zero-indexed page numbers
-    # Removes leading p. and expands ranges into a list of integers (inclusive)
-    def parse_pdf_pages(self, index=None):
-        row = self.get_current_row() if index is None else self.df.iloc[index]
-        # Pull the plain text entry and remove whitespace
-        page_field = str(row.get("PDF Page Number", "")).strip()
+    # Parse every 'PDF Page Number' field once, into PAGES_COLUMN and PAGE_ERROR_COLUMN
+    # Fields repeat a lot across a MID, so each distinct value is parsed only once
+    def parse_page_column(self, df):
+        start_time = time.perf_counter()
+        fields = df["PDF Page Number"].fillna("").astype(str)
+        parsed = {field: parse_page_field(field) for field in fields.unique()}
+        df[PAGES_COLUMN] = [parsed[field][0] for field in fields]
+        df[PAGE_ERROR_COLUMN] = [parsed[field][1] for field in fields]
 
-        if not page_field:
-            self.logger.warning(f"No page field listed for {row.get("agency_yr","")} on line {str(index)}")
-            return []
+        malformed = self.malformed_page_fields(df)
+        self.logger.info(
+            f"Parsed {len(parsed):,} distinct page fields in {time.perf_counter() - start_time:.3f}s; "
+            f"{len(malformed):,} of {len(df):,} MID rows have malformed page fields"
+        )
+        # One line per malformed row, with the row number as shown in Excel (header is line 1)
+        for position, page_field, error in malformed:
+            self.logger.warning(
+                f"MID line {position + 2} ({df['agency_yr'].iat[position]}): PDF Page Number '{page_field}' - {error}"
+            )
 
-        self.logger.debug(f"parsing {page_field}")
-        page_field = page_field.lower().replace("p.", "")
+    def malformed_page_fields(self, df=None):
+        """Returns (row index, page field, error) for every row whose page field didn't parse cleanly."""
+        df = self.df if df is None else df
+        positions = (df[PAGE_ERROR_COLUMN] != "").to_numpy().nonzero()[0]
+        return [(int(i), df["PDF Page Number"].iat[i], df[PAGE_ERROR_COLUMN].iat[i]) for i in positions]
 
-        # pages is the empty array that the individual document pages will be loaded into
-        pages = []
+    # Hash index per INDEXED_COLUMNS entry: value -> sorted row ids (positions in the full MID)
+    def build_indexes(self, df):
+        start_time = time.perf_counter()
+        indexes = {
+            name: {
+                value: np.asarray(row_ids, dtype=np.int64)
+                for value, row_ids in df.groupby(column, sort=False, observed=True).indices.items()
+            }
+            for name, column in INDEXED_COLUMNS.items()
+        }
+        self.logger.info(
+            f"Indexed MID in {time.perf_counter() - start_time:.3f}s: "
+            + ", ".join(f"{len(index):,} {name} values" for name, index in indexes.items())
+        )
+        return indexes
 
-        try:
-            # Match comma-separated values like "p.3, p.5-7"
-            for part in re.split(r"[,\s]+", page_field):
-                if '-' in part:
-                    start, end = map(int, part.split('-'))
-                    pages.extend(range(start - 1, end))  # zero-indexed
-                    self.logger.debug(f"Page range: {start} - {end}")
-                elif part.isdigit():
-                    pages.append(int(part) - 1)
-                    self.logger.debug(f"Single page: {int(part)}")
-        except Exception as e:
-            self.logger.warning(f"Failed to parse page numbers from '{page_field}': {e}")
-            return []
+    def rows_where(self, **conditions):
+        """
+        Returns the sorted row ids (positions in the full MID) matching every condition, e.g.
+        rows_where(agency="USDA", year=range(2002, 2009)) or rows_where(format_type={3, 4}).
+        Conditions are keyed by INDEXED_COLUMNS; each is one value or a collection of values (any of them).
+        With no conditions, every row is returned.
+        """
+        result = None
+        for name, wanted in conditions.items():
+            index = self.indexes[name]
+            if isinstance(wanted, (str, int, np.integer)):
+                wanted = [wanted]
+            matches = [index[value] for value in wanted if value in index]
+            row_ids = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+            result = row_ids if result is None else np.intersect1d(result, row_ids, assume_unique=True)
+        return np.arange(len(self.rows), dtype=np.int64) if result is None else result
+
+    def document_groups(self):
+        """
+        Groups the rows in the current view by document: [(agency_yr, [row indices])], in order of
+        each document's first row. Used to do all the work for one PDF while it is open.
+        """
+        if self.view is None:
+            groups = self.indexes["agency_yr"]
+            return sorted(((agency_yr, row_ids.tolist()) for agency_yr, row_ids in groups.items()), key=lambda g: g[1][0])
+        groups = {}
+        for index in range(len(self)):
+            groups.setdefault(self.row(index).get("agency_yr", ""), []).append(index)
+        return list(groups.items())
 
-        return sorted(set(p for p in pages if p >= 0))
+    # The row's zero-indexed pages, as parsed at load time
+    def parse_pdf_pages(self, index=None):
+        index = self.current_index if index is None else index
+        return list(self.row(index)[PAGES_COLUMN])
+
+    def page_field_error(self, index=None):
+        index = self.current_index if index is None else index
+        return self.row(index)[PAGE_ERROR_COLUMN]
 
     # Only show the rows passed in as an argument (for dev mode)
     def restrict_to_rows(self, row_indices):
-        """Restrict MID to a subset of row indices for focused review."""
-        self.df = self.df.iloc[row_indices].reset_index(drop=True)
+        """
+        Restrict MID to a subset of row indices (zero-indexed rows of the full MID) for focused review,
+        e.g. the row ids returned by rows_where().
+        """
+        self.view = [int(i) for i in row_indices]
         self.current_index = 0
+        # Row numbers changed meaning; page counts are cached, so this is cheap
+        if self.data_dir is not None:
+            self.build_validity_index(self.data_dir)
+
+    # Check every row once for the problems that make it unreviewable, so navigation can jump straight past them
+    def build_validity_index(self, data_dir):
+        """
+        A row is valid when it has an agency_yr, its PDF exists in data_dir, and its page field
+        parses to at least one page inside the document. Each PDF is opened once, only to read its page count.
+        Fills self.valid_rows and self.skip_reasons.
+        """
+        start_time = time.perf_counter()
+        self.data_dir = data_dir
+        self.valid_rows = []
+        self.skip_reasons = {}
+
+        for index in range(len(self)):
+            reason = self._invalid_reason(index)
+            if reason:
+                self.skip_reasons[index] = reason
+            else:
+                self.valid_rows.append(index)
+
+        self.logger.info(
+            f"Validity index built in {time.perf_counter() - start_time:.2f}s: "
+            f"{len(self.valid_rows):,} of {len(self):,} MID rows can be reviewed"
+        )
+
+    def _invalid_reason(self, index):
+        row = self.row(index)
+        agency_yr = str(row.get("agency_yr", "")).strip()
+        if not agency_yr:
+            return "missing agency_yr"
+        # Format_Type picks the scraper; blank or non-numeric values are pd.NA after load
+        if pd.isna(row.get("Format_Type", pd.NA)):
+            return "missing or invalid Format_Type"
+
+        # Handle any hyphen-underscore mixups
+        filename = f"{agency_yr.replace('-','_')}.pdf"
+        # Keyed by full path, so counts read from a previous dataDirectory are never reused
+        path = os.path.abspath(os.path.join(self.data_dir, filename))
+        if path not in self._page_counts:
+            self._page_counts[path] = self._read_page_count(path)
+        page_count = self._page_counts[path]
+        if page_count is None:
+            return f"PDF not found ({filename})"
+
+        pages = self.parse_pdf_pages(index)
+        if not pages:
+            return f"no valid pages in PDF Page Number field '{row.get('PDF Page Number', '')}' ({self.page_field_error(index)})"
+        if pages[-1] >= page_count:
+            return f"page {pages[-1] + 1} is past the end of {filename} ({page_count} pages)"
+        return None
+
+    def _read_page_count(self, path):
+        if not os.path.isfile(path):
+            return None
+        try:
+            with fitz.open(path) as doc:
+                return doc.page_count
+        except Exception as e:
+            self.logger.warning(f"Could not open {path} to count pages: {e}")
+            return None
+
+    def is_valid(self, index):
+        """True if the row passed the validity index (or no index has been built)."""
+        if not 0 <= index < len(self):
+            return False
+        return self.valid_rows is None or index not in self.skip_reasons
+
+    def next_valid_index(self, direction="next", index=None):
+        """
+        Returns the nearest valid row after (direction "next") or before ("prev") index,
+        defaulting to the current row, or None if there is none.
+        """
+        index = self.current_index if index is None else index
+        step = 1 if direction == "next" else -1
+        if self.valid_rows is None:
+            candidate = index + step
+            return candidate if 0 <= candidate < len(self) else None
+        if step == 1:
+            position = bisect_right(self.valid_rows, index)
+            return self.valid_rows[position] if position < len(self.valid_rows) else None
+        position = bisect_left(self.valid_rows, index)
+        return self.valid_rows[position - 1] if position > 0 else None
+
+    def skipped_between(self, start, end):
+        """Returns (row index, reason) for the invalid rows strictly between two row indices."""
+        low, high = min(start, end), max(start, end)
+        return [(i, self.skip_reasons[i]) for i in sorted(self.skip_reasons) if low < i < high]
+
+    def mark_invalid(self, index, reason):
+        """Drops a row from the validity index, e.g. after its document failed to open."""
+        if self.valid_rows is None:
+            return
+        self.skip_reasons[index] = reason
+        position = bisect_left(self.valid_rows, index)
+        if position < len(self.valid_rows) and self.valid_rows[position] == index:
+            del self.valid_rows[position]
@@ -0,0 +1,204 @@
+# page_viewer.py
+# PDF page display widget for the review app.
+# Pages are rendered at the resolution the viewer actually needs (its pixel size times the
+# screen's device pixel ratio) rather than a fixed zoom. Zooming (mouse wheel) and panning
+# (drag) re-render only the visible region of the page; a low-resolution crop of the
+# fitted page is shown immediately while the sharp render waits for the input to settle.
+# Double-click resets the zoom.
+
+import fitz  # PyMuPDF
+from PyQt5.QtWidgets import QLabel
+from PyQt5.QtCore import Qt, QTimer, QRectF
+from PyQt5.QtGui import QPixmap, QImage, QPainter, QPen, QColor
+from logger import setup_logger
+from image_utils import render_page, resolve_scale, fitz_lock, RenderCache
+
+
+# Quiet period after the last resize/zoom/pan before the page is re-rendered
+RENDER_DEBOUNCE_MS = 150
+MAX_ZOOM = 8.0
+ZOOM_STEP = 1.25
+HIGHLIGHT_COLOR = QColor(255, 140, 0)
+
+# Zoomed regions are one-off renders, so they get their own small cache instead of evicting the
+# full-page renders in the shared one that the prefetcher and the scrapers rely on
+ZOOM_CACHE_MB = 32
+_zoom_cache = RenderCache(ZOOM_CACHE_MB * 1024 * 1024)
+
+
+def _pixmap_to_qpixmap(pix):
+    with fitz_lock:
+        img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
+    return QPixmap.fromImage(img)
+
+
+class PageViewer(QLabel):
+    def __init__(self, text="", parent=None):
+        super().__init__(text, parent)
+        self.logger = setup_logger()
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumSize(1, 1)  # let the splitter shrink the viewer below the pixmap size
+        self.setToolTip("Mouse wheel to zoom, drag to pan, double-click to reset")
+
+        self.page = None
+        self.zoom = 1.0
+        self.center = None          # fitz.Point at the middle of the visible region (PDF coordinates)
+
+        self._fit_pixmap = None     # whole page, fitted to the viewer; source of zoom placeholders
+        self._fit_scale = 0
+        self._view_pixmap = None    # what is on screen now
+        self._view_clip = None      # region of the page _view_pixmap covers
+        self._view_scale = 0
+        self._drag_origin = None
+        self._highlights = []       # fitz.Rects (PDF coordinates) outlined on top of the page
+
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(RENDER_DEBOUNCE_MS)
+        self._render_timer.timeout.connect(self._render_sharp)
+
+    # Pixel box (in device pixels) that a page render has to fill
+    def render_size(self):
+        dpr = self.devicePixelRatioF()
+        return (max(self.width(), 1) * dpr, max(self.height(), 1) * dpr)
+
+    def set_page(self, page):
+        """Displays a new fitz.Page, fitted to the viewer and unzoomed."""
+        self.page = page
+        self.zoom = 1.0
+        self.center = None
+        self._highlights = []
+        self._render_timer.stop()
+        self._render_fit()
+
+    def set_highlights(self, rects):
+        """Outlines regions of the page (fitz.Rects in PDF coordinates), e.g. the table cells being reviewed."""
+        self._highlights = [fitz.Rect(r) for r in rects]
+        if self._view_pixmap is not None:
+            self._show(self._view_pixmap, self._view_clip, self._view_scale)
+
+    # ------------------------
+    # Rendering
+    # ------------------------
+    def _visible_clip(self):
+        """Region of the page in view, in PDF coordinates (the whole page when not zoomed)."""
+        rect = self.page.rect
+        if self.zoom <= 1.0:
+            return fitz.Rect(rect)
+        width, height = rect.width / self.zoom, rect.height / self.zoom
+        # Keep the visible region inside the page
+        cx = min(max(self.center.x, rect.x0 + width / 2), rect.x1 - width / 2)
+        cy = min(max(self.center.y, rect.y0 + height / 2), rect.y1 - height / 2)
+        self.center = fitz.Point(cx, cy)
+        return fitz.Rect(cx - width / 2, cy - height / 2, cx + width / 2, cy + height / 2)
+
+    def _render_fit(self):
+        scale = resolve_scale(self.page, size=self.render_size())
+        self._fit_pixmap = _pixmap_to_qpixmap(render_page(self.page, scale=scale))
+        self._fit_scale = scale
+        self._show(self._fit_pixmap, fitz.Rect(self.page.rect), scale)
+
+    def _render_sharp(self):
+        """Renders the visible region at the viewer's resolution, unless the current render is already sharp enough."""
+        if self.page is None:
+            return
+        clip = self._visible_clip()
+        needed_scale = resolve_scale(self.page, size=self.render_size(), clip=clip)
+        if self.zoom <= 1.0:
+            if needed_scale > self._fit_scale:
+                self.logger.debug(f"Viewer outgrew the page render, re-rendering at {needed_scale:.2f}x")
+                self._render_fit()
+            else:
+                self._show(self._fit_pixmap, fitz.Rect(self.page.rect), self._fit_scale)
+            return
+
+        if clip != self._view_clip or needed_scale > self._view_scale:
+            pixmap = _pixmap_to_qpixmap(render_page(self.page, scale=needed_scale, clip=clip, cache=_zoom_cache))
+            self.logger.debug(f"Rendered zoomed region {tuple(round(v) for v in clip)} at {needed_scale:.2f}x")
+            self._show(pixmap, clip, needed_scale)
+        else:
+            self._show(self._view_pixmap, self._view_clip, self._view_scale)
+
+    def _show_placeholder(self):
+        """Shows the visible region cropped from the fitted render right away; sharpened after the debounce."""
+        clip = self._visible_clip()
+        source = QRectF(
+            (clip.x0 - self.page.rect.x0) * self._fit_scale, (clip.y0 - self.page.rect.y0) * self._fit_scale,
+            clip.width * self._fit_scale, clip.height * self._fit_scale
+        ).toAlignedRect()
+        self._show(self._fit_pixmap.copy(source), clip, self._fit_scale, smooth=False)
+        self._render_timer.start()
+
+    def _show(self, pixmap, clip, scale, smooth=True):
+        self._view_pixmap, self._view_clip, self._view_scale = pixmap, clip, scale
+        dpr = self.devicePixelRatioF()
+        mode = Qt.SmoothTransformation if smooth else Qt.FastTransformation
+        scaled = pixmap.scaled(self.size() * dpr, Qt.KeepAspectRatio, mode)
+        if self._highlights:
+            self._draw_highlights(scaled, clip)
+        scaled.setDevicePixelRatio(dpr)
+        self.setPixmap(scaled)
+
+    # Highlights are drawn on the scaled copy only, so the cached renders stay clean
+    def _draw_highlights(self, pixmap, clip):
+        ratio = pixmap.width() / clip.width
+        painter = QPainter(pixmap)
+        painter.setPen(QPen(HIGHLIGHT_COLOR, max(2, round(ratio))))
+        for rect in self._highlights:
+            if not rect.intersects(clip):
+                continue
+            painter.drawRect(QRectF(
+                (rect.x0 - clip.x0) * ratio, (rect.y0 - clip.y0) * ratio, rect.width * ratio, rect.height * ratio
+            ))
+        painter.end()
+
+    # Logical screen pixels per PDF unit in the current view, used to turn mouse drags into pans
+    def _screen_ratio(self):
+        return min(self.width() / self._view_clip.width, self.height() / self._view_clip.height)
+
+    # ------------------------
+    # Events
+    # ------------------------
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self._view_pixmap is not None:
+            self._show(self._view_pixmap, self._view_clip, self._view_scale, smooth=False)
+            self._render_timer.start()
+
+    def wheelEvent(self, event):
+        if self.page is None:
+            return
+        steps = event.angleDelta().y() / 120
+        zoom = min(max(self.zoom * (ZOOM_STEP ** steps), 1.0), MAX_ZOOM)
+        if zoom == self.zoom:
+            return
+        if self.center is None:
+            self.center = fitz.Point((self.page.rect.x0 + self.page.rect.x1) / 2, (self.page.rect.y0 + self.page.rect.y1) / 2)
+        self.zoom = zoom
+        self._show_placeholder()
+
+    def mousePressEvent(self, event):
+        if self.page is not None and self.zoom > 1.0 and event.button() == Qt.LeftButton:
+            self._drag_origin = event.pos()
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._drag_origin is not None:
+            delta = event.pos() - self._drag_origin
+            self._drag_origin = event.pos()
+            ratio = self._screen_ratio()
+            self.center = fitz.Point(self.center.x - delta.x() / ratio, self.center.y - delta.y() / ratio)
+            self._show_placeholder()
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        self._drag_origin = None
+        super().mouseReleaseEvent(event)
+
+    def mouseDoubleClickEvent(self, event):
+        if self.page is not None and self.zoom > 1.0:
+            self.zoom = 1.0
+            self.center = None
+            self._render_timer.stop()
+            self._show(self._fit_pixmap, fitz.Rect(self.page.rect), self._fit_scale)
+        super().mouseDoubleClickEvent(event)
@@ -0,0 +1,179 @@
+# review_journal.py
+# Append-only journal of review decisions (Accept/Reject), written by a background thread.
+# Every decision is one JSON line. Lines are written and fsynced in batches, so a crash loses at most
+# the last FLUSH_INTERVAL_S seconds of work and a torn final line is skipped on replay.
+# The thread also writes the accepted/rejected text files for user mode, keeping disk I/O off the UI thread.
+
+import os
+import json
+import queue
+import time
+import threading
+from datetime import datetime
+from logger import setup_logger
+
+
+# How long the writer waits to gather more work into one batch before syncing it to disk
+FLUSH_INTERVAL_S = 0.5
+# How long flush() and close() wait for the writer before reporting failure
+FLUSH_TIMEOUT_S = 10
+
+JOURNAL_FILENAME = "review_journal.jsonl"
+
+
+def journal_path(settings):
+    return os.path.join(settings.get("logFileDirectory", "./logs"), JOURNAL_FILENAME)
+
+
+def replay(path):
+    """Returns every decision recorded in a journal file, oldest first. Unreadable lines are skipped."""
+    logger = setup_logger()
+    records = []
+    if not os.path.isfile(path):
+        return records
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                # Most likely the last line of a session that crashed mid-write
+                logger.warning(f"Skipping unreadable line {line_number} in review journal {path}")
+    return records
+
+
+def latest_decisions(records, test_name):
+    """
+    Folds journal records into the current decision per audit row for one test (later decisions win).
+    Returns {audit index: record}.
+    """
+    decisions = {}
+    for record in records:
+        if record.get("mode") == "dev" and record.get("test") == test_name and "audit_index" in record:
+            decisions[record["audit_index"]] = record
+    return decisions
+
+
+class ReviewJournal:
+    def __init__(self, path, flush_interval=FLUSH_INTERVAL_S):
+        self.logger = setup_logger()
+        self.path = path
+        self.flush_interval = flush_interval
+        # Set if the journal can't be opened, or a decision or output file could not be written.
+        # Without a journal, decisions are not recorded, but the review output files still are.
+        self.error = None
+        self._journal = self._open()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="review-journal", daemon=True)
+        self._thread.start()
+
+    def record(self, **fields):
+        """Queues one decision for the journal and returns the record (with its timestamp)."""
+        record = {"time": datetime.now().isoformat(timespec="seconds"), **fields}
+        self._queue.put(("record", record))
+        return record
+
+    def write_text(self, path, text):
+        """Queues a text file to be written (replacing any existing file) by the journal thread."""
+        self._queue.put(("file", (path, text)))
+
+    def flush(self, timeout=FLUSH_TIMEOUT_S):
+        """
+        Blocks until everything queued so far is on disk, for at most timeout seconds.
+        Returns False if the journal isn't being written or the wait timed out.
+        """
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        if not done.wait(timeout):
+            self.logger.error(f"Review journal {self.path} was not flushed within {timeout}s")
+            return False
+        return self.error is None
+
+    def close(self, timeout=FLUSH_TIMEOUT_S):
+        """Writes out anything still queued and stops the thread."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            self.logger.error(f"Review journal {self.path} did not finish writing within {timeout}s")
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            journal = open(self.path, "a", encoding="utf-8")
+            # Start on a fresh line if the previous session died halfway through one
+            if journal.tell() > 0 and not self._ends_with_newline():
+                journal.write("\n")
+            return journal
+        except OSError as e:
+            self.error = f"Could not open review journal {self.path}: {e}"
+            self.logger.error(f"{self.error}. Review decisions will not be journalled.")
+            return None
+
+    def _run(self):
+        journal = self._journal
+        try:
+            while True:
+                batch = [self._queue.get()]
+                # Gather whatever else arrives within the flush interval into the same batch
+                deadline = time.monotonic() + self.flush_interval
+                while batch[-1] is not None and batch[-1][0] != "flush":
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                self._write_batch(journal, [item for item in batch if item is not None])
+                if batch[-1] is None:
+                    return
+        finally:
+            if journal is not None:
+                journal.close()
+
+    def _ends_with_newline(self):
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    # Any failure is caught per item and recorded in self.error, so one bad record or file never stops the thread
+    def _write_batch(self, journal, batch):
+        waiters = []
+        for kind, payload in batch:
+            if kind == "record" and journal is not None:
+                try:
+                    journal.write(json.dumps(payload) + "\n")
+                except Exception as e:
+                    self.error = f"Failed to write a decision to review journal {self.path}: {e}"
+                    self.logger.error(f"{self.error} ({payload!r})")
+            elif kind == "file":
+                self._write_file(*payload)
+            elif kind == "flush":
+                waiters.append(payload)
+        try:
+            if journal is not None:
+                journal.flush()
+                os.fsync(journal.fileno())
+        except Exception as e:
+            self.error = f"Failed to sync review journal {self.path}: {e}"
+            self.logger.error(self.error)
+        for done in waiters:
+            done.set()
+
+    def _write_file(self, path, text):
+        temp_path = f"{path}.tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+            os.replace(temp_path, path)
+            self.logger.info(f"Saved review output to {path}")
+        except Exception as e:
+            self.error = f"Failed to write review output {path}: {e}"
+            self.logger.error(self.error)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
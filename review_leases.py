@@ -0,0 +1,227 @@
+# review_leases.py
+# Splits a MID between several reviewers through a shared SQLite file (e.g. on a network drive).
+# Each running review app leases a batch of rows, reviews them, and records its decisions with the
+# reviewer's name. Leases expire if they are not renewed (e.g. the app crashed), and expired rows
+# are handed out again. Rows that already have a decision are never leased again.
+
+import os
+import time
+import json
+import socket
+import getpass
+import sqlite3
+from logger import setup_logger
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS leases (
+    mid_key     TEXT NOT NULL,
+    row_index   INTEGER NOT NULL,
+    reviewer    TEXT NOT NULL,
+    expires_at  REAL NOT NULL,
+    PRIMARY KEY (mid_key, row_index)
+);
+CREATE TABLE IF NOT EXISTS decisions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    mid_key     TEXT NOT NULL,
+    row_index   INTEGER NOT NULL,
+    reviewer    TEXT NOT NULL,
+    status      TEXT NOT NULL,
+    label       TEXT,
+    pages       TEXT,
+    decided_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decisions_row ON decisions (mid_key, row_index);
+"""
+
+# How long to wait for another reviewer's transaction before giving up, in seconds
+BUSY_TIMEOUT_S = 30
+
+
+def default_reviewer():
+    """Identity used when the reviewerName setting is blank."""
+    return f"{getpass.getuser()}@{socket.gethostname()}"
+
+def mid_key(settings):
+    """
+    Identifies a MID in the shared store; everyone reviewing the same file and sheet shares rows.
+    The file is identified by its full resolved path, so copies with the same name don't share rows.
+    realpath also turns a mapped network drive into its UNC path, so reviewers whose drive letters
+    differ still agree.
+    """
+    location = settings.get("MIDLocation", "")
+    path = os.path.normcase(os.path.realpath(location)) if location else ""
+    return f"{path}:{settings.get('MIDSheetName', '') or 0}"
+
+
+class LeaseStore:
+    def __init__(self, db_path):
+        self.logger = setup_logger()
+        self.db_path = db_path
+        db_dir = os.path.dirname(db_path)
+        if db_dir:
+            os.makedirs(db_dir, exist_ok=True)
+        # Autocommit mode; write transactions are opened explicitly with BEGIN IMMEDIATE.
+        # The default rollback journal is used rather than WAL, which isn't safe on network filesystems.
+        self.conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT_S, isolation_level=None)
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def acquire(self, key, reviewer, candidate_rows, batch_size, lease_seconds):
+        """
+        Leases up to batch_size rows to a reviewer, taken in order from candidate_rows.
+        Rows the reviewer still holds (e.g. from a session that crashed) come back first.
+        Rows leased to someone else or already decided are skipped. Returns the sorted leased rows.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("DELETE FROM leases WHERE mid_key = ? AND expires_at < ?", (key, now))
+            held = [
+                r for (r,) in self.conn.execute(
+                    "SELECT row_index FROM leases WHERE mid_key = ? AND reviewer = ?", (key, reviewer)
+                )
+            ]
+            taken = {
+                r for (r,) in self.conn.execute(
+                    "SELECT row_index FROM leases WHERE mid_key = ? UNION SELECT row_index FROM decisions WHERE mid_key = ?",
+                    (key, key)
+                )
+            }
+            rows = held[:batch_size]
+            for row in candidate_rows:
+                if len(rows) >= batch_size:
+                    break
+                if row not in taken:
+                    rows.append(row)
+
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO leases (mid_key, row_index, reviewer, expires_at) VALUES (?, ?, ?, ?)",
+                [(key, row, reviewer, now + lease_seconds) for row in rows]
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return sorted(rows)
+
+    def renew(self, key, reviewer, lease_seconds):
+        """Extends every lease the reviewer holds. Returns the rows still held (others may have expired and been taken)."""
+        self.conn.execute(
+            "UPDATE leases SET expires_at = ? WHERE mid_key = ? AND reviewer = ?",
+            (time.time() + lease_seconds, key, reviewer)
+        )
+        return {
+            r for (r,) in self.conn.execute(
+                "SELECT row_index FROM leases WHERE mid_key = ? AND reviewer = ?", (key, reviewer)
+            )
+        }
+
+    def release(self, key, reviewer, rows=None):
+        """Gives back the reviewer's leases (all of them, or just rows) so others can take them straight away."""
+        if rows is None:
+            self.conn.execute("DELETE FROM leases WHERE mid_key = ? AND reviewer = ?", (key, reviewer))
+        else:
+            self.conn.executemany(
+                "DELETE FROM leases WHERE mid_key = ? AND reviewer = ? AND row_index = ?",
+                [(key, reviewer, row) for row in rows]
+            )
+
+    def record_decision(self, key, reviewer, row, status, label="", pages=None):
+        """Records a decision and frees the row's lease; the row is then done for every reviewer."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute(
+                "INSERT INTO decisions (mid_key, row_index, reviewer, status, label, pages, decided_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, row, reviewer, status, label, json.dumps(pages or []), time.time())
+            )
+            self.conn.execute(
+                "DELETE FROM leases WHERE mid_key = ? AND row_index = ? AND reviewer = ?", (key, row, reviewer)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+    def progress(self, key):
+        """Returns (rows decided, rows currently leased) across all reviewers."""
+        decided = self.conn.execute(
+            "SELECT COUNT(DISTINCT row_index) FROM decisions WHERE mid_key = ?", (key,)
+        ).fetchone()[0]
+        leased = self.conn.execute(
+            "SELECT COUNT(*) FROM leases WHERE mid_key = ? AND expires_at >= ?", (key, time.time())
+        ).fetchone()[0]
+        return decided, leased
+
+
+class LeaseSession:
+    """One reviewer's batch of rows in a MID, and navigation through it."""
+    def __init__(self, store, key, reviewer, batch_size=20, lease_seconds=1800):
+        self.logger = setup_logger()
+        self.store = store
+        self.key = key
+        self.reviewer = reviewer
+        self.batch_size = batch_size
+        self.lease_seconds = lease_seconds
+        self.batch = []         # rows leased in the current batch, sorted
+        self.decided = set()    # rows of the batch this session has recorded a decision for
+        self.passed = set()     # rows this session moved past without deciding, left for other reviewers
+
+    def next_row(self, mid_manager, direction="next", index=None):
+        """
+        Returns the next row to review in this reviewer's batch, or None.
+        Moving forward past the end of the batch leases a new one.
+        """
+        row = self.peek_row(mid_manager, direction, index)
+        if row is None and direction == "next":
+            self.acquire_batch(mid_manager)
+            row = self.peek_row(mid_manager, direction, -1)
+        return row
+
+    def peek_row(self, mid_manager, direction="next", index=None):
+        """Like next_row, but never leases more rows (used for prefetching)."""
+        index = mid_manager.current_index if index is None else index
+        if direction == "next":
+            rows = [r for r in self.batch if r > index and r not in self.decided and mid_manager.is_valid(r)]
+            return rows[0] if rows else None
+        rows = [r for r in self.batch if r < index and mid_manager.is_valid(r)]
+        return rows[-1] if rows else None
+
+    def acquire_batch(self, mid_manager):
+        candidates = mid_manager.valid_rows if mid_manager.valid_rows is not None else range(len(mid_manager))
+        # Hand back whatever is left of the old batch before taking a new one, and don't take it again
+        undecided = [r for r in self.batch if r not in self.decided]
+        self.store.release(self.key, self.reviewer, undecided)
+        self.passed.update(undecided)
+        candidates = [r for r in candidates if r not in self.passed]
+        self.batch = self.store.acquire(self.key, self.reviewer, candidates, self.batch_size, self.lease_seconds)
+        self.decided = set()
+        decided, leased = self.store.progress(self.key)
+        self.logger.info(
+            f"{self.reviewer} leased {len(self.batch)} MID rows {self.batch[:1]}..{self.batch[-1:]}; "
+            f"{decided:,} rows decided and {leased:,} leased across all reviewers"
+        )
+        return self.batch
+
+    def decide(self, row, status, label="", pages=None):
+        self.store.record_decision(self.key, self.reviewer, row, status, label, pages)
+        self.decided.add(row)
+
+    def renew(self):
+        held = self.store.renew(self.key, self.reviewer, self.lease_seconds)
+        lost = [r for r in self.batch if r not in held and r not in self.decided]
+        if lost:
+            self.logger.warning(f"Leases on MID rows {lost} expired and were released")
+            self.batch = [r for r in self.batch if r not in lost]
+
+    def status_text(self):
+        decided, leased = self.store.progress(self.key)
+        remaining = len([r for r in self.batch if r not in self.decided])
+        return f"Reviewer {self.reviewer}: {remaining} row(s) left in batch, {decided:,} decided by all reviewers"
+
+    def close(self):
+        self.store.release(self.key, self.reviewer, [r for r in self.batch if r not in self.decided])
+        self.store.close()
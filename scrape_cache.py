@@ -0,0 +1,264 @@
+# scrape_cache.py
+# Persistent, content-addressed cache of scraper output, shared by the review app and the audit.
+# Results are stored one page at a time, keyed by a hash of the PDF's contents, the page index,
+# the scraper's class and the source it was loaded from, and the metadata the scraper was given.
+# Changing the PDF or reloading an edited scraper produces new keys, so stale results are never read back; they simply
+# age out once the cache is over its size limit (least recently used first).
+
+import os
+import json
+import hashlib
+import threading
+from logger import setup_logger
+from image_utils import fitz_lock
+
+
+# Bump to invalidate every stored result, e.g. if the chunk layout changes
+CACHE_VERSION = 1
+DEFAULT_SCRAPE_CACHE_MB = 512
+
+# After an eviction the cache is trimmed to this fraction of its limit, so it isn't rescanned on every write
+EVICT_TO_FRACTION = 0.9
+
+# Statuses of pages that failed to scrape. These are never cached, so the page is tried again next time
+# (the failure may have been transient: a killed worker, running out of memory).
+ERROR_STATUS_PREFIX = "FATAL ERROR"
+
+
+def file_hash(path, block_size=1 << 20):
+    """Returns the SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ScrapeCache:
+    """
+    Directory of JSON files, one per (document contents, page, scraper, metadata) combination.
+    Safe to share between threads; separate processes may use the same directory as files are replaced atomically.
+    """
+    def __init__(self, cache_dir, max_bytes):
+        self.logger = setup_logger()
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._hashes = {}   # (path, mtime, size) -> content hash, so each file is hashed once per session
+        self._bytes = None  # total size on disk, measured on first write
+
+    def _content_hash(self, path):
+        stat = os.stat(path)
+        stamp = (os.path.abspath(path), stat.st_mtime, stat.st_size)
+        with self._lock:
+            cached = self._hashes.get(stamp)
+        if cached is None:
+            cached = file_hash(path)
+            with self._lock:
+                self._hashes[stamp] = cached
+        return cached
+
+    def page_key(self, page, scraper_class, metadata=None):
+        """
+        Returns the cache key for one fitz.Page scraped by scraper_class, or None if the page
+        can't be keyed (in-memory document, or a scraper that wasn't loaded from a file).
+        The scraper is identified by the hash of the source it was loaded from (see load_scraper_class),
+        so a tool file edited while the app runs doesn't store the old code's output under the new key.
+        """
+        doc_path = page.parent.name
+        scraper_hash = getattr(scraper_class, "source_hash", None)
+        if not doc_path or not os.path.isfile(doc_path) or not scraper_hash:
+            return None
+        material = json.dumps([
+            CACHE_VERSION,
+            self._content_hash(doc_path),
+            page.number,
+            scraper_class.__name__,
+            scraper_hash,
+            metadata or {},
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Returns the stored output dictionary for a key, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                output = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Discarding unreadable scrape cache entry {path}: {e}")
+            self._remove(path)
+            return None
+        # The modification time doubles as the last-used time for eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return output
+
+    def put(self, key, output):
+        """Stores a validated output dictionary. Outputs that aren't JSON-serializable are skipped."""
+        try:
+            payload = json.dumps(output)
+        except (TypeError, ValueError) as e:
+            self.logger.debug(f"Not caching scrape output for {key}: {e}")
+            return
+        if len(payload) > self.max_bytes:
+            return
+
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(payload)
+        os.replace(temp_path, path)
+
+        with self._lock:
+            if self._bytes is None:
+                self._bytes = self._measure()
+            else:
+                self._bytes += len(payload)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            if self._bytes is not None and self._bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        with self._lock:
+            for path, _, _ in self._entries():
+                self._remove(path)
+            self._bytes = 0
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".json"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _measure(self):
+        return sum(size for _, _, size in self._entries())
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total = sum(size for _, _, size in entries)
+        target = self.max_bytes * EVICT_TO_FRACTION
+        removed = 0
+        for path, _, size in entries:
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+            removed += 1
+        self._bytes = total
+        self.logger.debug(f"Scrape cache evicted {removed} entries, {total / (1024 * 1024):.1f} MB remain")
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+# One cache object per directory, shared by everything in the process
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_scrape_cache(settings):
+    """Returns the shared ScrapeCache configured in settings, or None if caching is turned off."""
+    cache_dir = settings.get("scrapeCacheDirectory", "")
+    try:
+        max_mb = int(settings.get("scrapeCacheMB", DEFAULT_SCRAPE_CACHE_MB))
+    except (TypeError, ValueError):
+        max_mb = DEFAULT_SCRAPE_CACHE_MB
+    if not cache_dir or max_mb <= 0:
+        return None
+
+    with _caches_lock:
+        cache = _caches.get(os.path.abspath(cache_dir))
+        if cache is None:
+            cache = ScrapeCache(cache_dir, max_mb * 1024 * 1024)
+            _caches[os.path.abspath(cache_dir)] = cache
+    cache.set_max_bytes(max_mb * 1024 * 1024)
+    return cache
+
+
+def _scrape_pages(scraper_class, pages, metadata, pool):
+    """Per-page chunks for pages, from the scraper pool when one is given and takes the tool, otherwise in-process."""
+    if pool is not None and pool.accepts(scraper_class, pages):
+        return pool.iter_scrape(scraper_class, pages, metadata)
+    chunks = scraper_class(pages, metadata).iter_scrape(collect=False)
+    # Thread-safe tools take fitz_lock around their own PyMuPDF calls
+    return chunks if getattr(scraper_class, "thread_safe", False) else _locked(chunks)
+
+
+def _locked(chunks):
+    """Runs an in-process scrape one page at a time under the fitz lock, for tools that don't take it themselves."""
+    chunks = iter(chunks)
+    while True:
+        with fitz_lock:
+            chunk = next(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def iter_cached_scrape(scraper, cache, pool=None):
+    """
+    Streams a scraper's output one page at a time like scraper.iter_scrape(collect=False),
+    yielding (page_idx, chunk). Pages found in the cache are served from it; the rest are
+    scraped in a single run of the same scraper class and stored as they complete.
+    Pass cache=None to scrape everything. With a ScraperPool (see scraper_pool.py) the
+    scraping itself runs in a worker process.
+    """
+    scraper_class = scraper.__class__
+    if cache is None:
+        yield from enumerate(_scrape_pages(scraper_class, scraper.pages, scraper.metadata, pool))
+        return
+
+    keys = [cache.page_key(page, scraper_class, scraper.metadata) for page in scraper.pages]
+    missing = []
+    for page_idx, key in enumerate(keys):
+        chunk = cache.get(key) if key else None
+        if chunk is None:
+            missing.append(page_idx)
+        else:
+            yield page_idx, chunk
+
+    if not missing:
+        return
+    remaining = _scrape_pages(scraper_class, [scraper.pages[i] for i in missing], scraper.metadata, pool)
+    for page_idx, chunk in zip(missing, remaining):
+        if keys[page_idx] and not str(chunk.get("status", "")).startswith(ERROR_STATUS_PREFIX):
+            cache.put(keys[page_idx], chunk)
+        yield page_idx, chunk
+
+
+def scrape_with_cache(scraper, cache, pool=None):
+    """Fills in scraper.result through the cache and returns it, as scraper.scrape() followed by scraper.result would."""
+    chunks = dict(iter_cached_scrape(scraper, cache, pool))
+    missing = [i for i in range(len(scraper.pages)) if i not in chunks]
+    if missing:
+        raise ValueError(
+            f"{scraper.__class__.__name__} returned {len(chunks)} of {len(scraper.pages)} pages, "
+            f"nothing for page(s) {', '.join(str(getattr(scraper.pages[i], 'number', i) + 1) for i in missing)}"
+        )
+    scraper.load_chunks([chunks[i] for i in range(len(scraper.pages))])
+    return scraper.result
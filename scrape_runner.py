@@ -0,0 +1,134 @@
+# scrape_runner.py
+# Runs scraping jobs for the review app in a worker thread, so the window keeps repainting
+# while slow scrapers (e.g. TableScraper with DETR + tesseract) work through a document.
+# Results are reported page by page through Qt signals. Starting a new job cancels the
+# previous one, and anything a stale job still emits is dropped before it reaches the UI.
+
+import threading
+import fitz  # PyMuPDF
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+from logger import setup_logger
+from image_utils import fitz_lock
+from entry_loader import scrape_mid_entry
+
+
+class _JobSignals(QObject):
+    page_ready = pyqtSignal(int, int, str, object)  # job id, page index within the job, scraped text, table records
+    failed = pyqtSignal(int, str)           # job id, error message
+    finished = pyqtSignal(int, bool)        # job id, cancelled
+
+
+class _ScrapeJob(QRunnable):
+    def __init__(self, job_id, path, page_indices, format_type, label, settings, signals):
+        super().__init__()
+        self.setAutoDelete(False)  # the runner keeps a reference so it can be cancelled
+        self.job_id = job_id
+        self.path = path
+        self.page_indices = page_indices
+        self.format_type = format_type
+        self.label = label
+        self.settings = settings
+        self.signals = signals
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        # The worker opens its own handle so it never shares a fitz.Document with the UI thread
+        try:
+            with fitz_lock:
+                doc = fitz.open(self.path)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, f"Could not open {self.path}: {e}")
+            self.signals.finished.emit(self.job_id, False)
+            return
+
+        entry = {
+            "label": self.label,
+            "doc": doc,
+            "page_indices": self.page_indices,
+            "format_type": self.format_type,
+            "page_text_cache": [""] * len(self.page_indices),
+            "page_tables_cache": [[] for _ in self.page_indices],
+        }
+        try:
+            for page_idx, text, tables in scrape_mid_entry(entry, self.settings, self.cancel_event):
+                self.signals.page_ready.emit(self.job_id, page_idx, text, tables)
+        finally:
+            with fitz_lock:
+                doc.close()
+
+        if entry.get("error"):
+            self.signals.failed.emit(self.job_id, entry["error"])
+        self.signals.finished.emit(self.job_id, self.cancel_event.is_set())
+
+
+class ScrapeRunner(QObject):
+    # Re-emitted for the current job only
+    page_ready = pyqtSignal(int, str, object)   # page index within the job, scraped text, table records
+    progress = pyqtSignal(int, int)     # pages done, total pages
+    failed = pyqtSignal(str)
+    finished = pyqtSignal(bool)         # cancelled
+
+    def __init__(self, settings, parent=None):
+        super().__init__(parent)
+        self.logger = setup_logger()
+        self.settings = settings
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self._signals = _JobSignals()
+        self._signals.page_ready.connect(self._on_page_ready)
+        self._signals.failed.connect(self._on_failed)
+        self._signals.finished.connect(self._on_finished)
+        self._job = None
+        self._jobs = {}     # job id -> job, kept alive until its worker has returned
+        self._next_id = 0
+        self._done = 0
+
+    def is_running(self):
+        return self._job is not None
+
+    def start(self, path, page_indices, format_type, label):
+        """Cancels any running job and starts scraping the given pages. Returns the new job id."""
+        self.cancel()
+        self._next_id += 1
+        self._done = 0
+        self._job = _ScrapeJob(
+            self._next_id, path, list(page_indices), format_type, label, self.settings, self._signals
+        )
+        self._jobs[self._next_id] = self._job
+        self.pool.start(self._job)
+        self.progress.emit(0, len(page_indices))
+        self.logger.debug(f"Started scrape job {self._next_id} for {label}, pages {[p + 1 for p in page_indices]}")
+        return self._next_id
+
+    def cancel(self):
+        """Cancels the current job; nothing it emits afterwards reaches the UI."""
+        if self._job is None:
+            return
+        self._job.cancel_event.set()
+        if self.pool.tryTake(self._job):
+            # Never started, so no finished signal will come to release it
+            self._jobs.pop(self._job.job_id, None)
+        self.logger.debug(f"Cancelled scrape job {self._job.job_id}")
+        self._job = None
+        self.finished.emit(True)
+
+    def _is_current(self, job_id):
+        return self._job is not None and self._job.job_id == job_id
+
+    def _on_page_ready(self, job_id, page_idx, text, tables):
+        if not self._is_current(job_id):
+            return
+        self._done += 1
+        self.page_ready.emit(page_idx, text, tables)
+        self.progress.emit(self._done, len(self._job.page_indices))
+
+    def _on_failed(self, job_id, message):
+        if self._is_current(job_id):
+            self.failed.emit(message)
+
+    def _on_finished(self, job_id, cancelled):
+        self._jobs.pop(job_id, None)
+        if not self._is_current(job_id):
+            return
+        self._job = None
+        self.finished.emit(cancelled)
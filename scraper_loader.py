@@ -1,6 +1,9 @@
 import importlib.util
 import os
+import hashlib
+import json
 import inspect
+import threading
 from base_scraper import BaseScraper
 from logger import setup_logger
 
@@ -14,6 +17,10 @@ def load_scraper_class(filepath):
 		logger.critical(f"failed to load scraper specification from {filepath}")
 		raise ImportError(f"Could not load scraping module specification from {filepath}")
 
+	# Hash the source as it is loaded; the class keeps running this code even if the file is edited later
+	with open(filepath, "rb") as f:
+		source_hash = hashlib.sha256(f.read()).hexdigest()
+
 	# Load the scraper
 	module = importlib.util.module_from_spec(spec)
 	
@@ -24,26 +31,99 @@ def load_scraper_class(filepath):
 	# This only accepts the first subclass found, generalize in case multi-page scrapers or other similar tools are useful
 	for _, obj in inspect.getmembers(module, inspect.isclass):
 		if issubclass(obj, BaseScraper) and obj is not BaseScraper:
+			# Remember where the tool came from and which version of it was loaded; the scrape cache keys results by the hash
+			obj.source_path = os.path.abspath(filepath)
+			obj.source_hash = source_hash
 			logger.debug("Scraper loaded from file, returning")
 			return obj
 	logger.error(f"No subclass of BaseScraper found in {filepath}, ensure the scraper is defined properly")
 	raise ImportError(f"No subclass of BaseScraper found in {filepath}")
 
+# Format_Type -> scraper class table built from settings["scrapingTools"]
+# Every tool is imported once when the table is built, so picking a scraper for a row is a dict lookup
+class ScraperDispatch:
+	def __init__(self, settings):
+		self.logger = setup_logger()
+		self.by_format = {}		# format type -> scraper class
+		self.tool_names = {}	# format type -> name of the tool it maps to
+		self.default = None
+		self.default_name = settings.get("defaultScraper", "")
+		self.problems = []		# configuration problems found while building the table
+
+		tools = settings.get("scrapingTools", {})
+		classes = {}	# absolute path -> loaded class, tools sharing a file share the class
+		for tool_name, tool_data in tools.items():
+			path = os.path.abspath(tool_data.get("path", ""))
+			if path not in classes:
+				try:
+					classes[path] = load_scraper_class(path)
+					self.logger.debug(f"Scraping tool \"{tool_name}\" capabilities: {classes[path].capabilities()}")
+				except Exception as e:
+					classes[path] = None
+					self._problem(f"Scraping tool \"{tool_name}\" could not be loaded from {path}: {e}")
+			if classes[path] is None:
+				continue
+
+			for format_type in tool_data.get("format_types", []):
+				try:
+					format_type = int(format_type)
+				except (TypeError, ValueError):
+					self._problem(f"Scraping tool \"{tool_name}\" lists an invalid format type {format_type!r}")
+					continue
+				# The first tool listing a format type wins, as when tools were searched in order
+				if format_type in self.by_format:
+					self._problem(
+						f"Format type {format_type} is mapped to both \"{self.tool_names[format_type]}\" "
+						f"and \"{tool_name}\", using \"{self.tool_names[format_type]}\""
+					)
+					continue
+				self.by_format[format_type] = classes[path]
+				self.tool_names[format_type] = tool_name
+
+		if self.default_name in tools:
+			self.default = classes.get(os.path.abspath(tools[self.default_name].get("path", "")))
+		elif self.default_name:
+			self._problem(f"Default scraper \"{self.default_name}\" is not a configured scraping tool")
+		if self.default is None:
+			self.logger.warning("No default scraper available, unmapped format types cannot be scraped")
+
+		self.logger.info(
+			f"Scraper dispatch built: {len(self.by_format)} format type(s) mapped to "
+			f"{len(set(self.tool_names.values()))} tool(s), default \"{self.default_name}\""
+		)
+
+	def _problem(self, message):
+		self.problems.append(message)
+		self.logger.warning(message)
+
+	def lookup(self, format_type):
+		"""Returns the scraper class for a format type, falling back to the default scraper."""
+		try:
+			return self.by_format[int(format_type)]
+		except (KeyError, TypeError, ValueError):
+			pass
+		if self.default is not None:
+			return self.default
+		raise ValueError(f"No scraper found for format type {format_type}")
+
+	def unmapped(self, format_types):
+		"""Returns the given format types (e.g. every Format_Type in the MID) that have no scraper of their own."""
+		return sorted({int(ft) for ft in format_types} - set(self.by_format))
+
+
+# The dispatch table for the current scraping tool settings, rebuilt only when those settings change
+_dispatch = None
+_dispatch_key = None
+_dispatch_lock = threading.Lock()
+
+def get_scraper_dispatch(settings):
+	global _dispatch, _dispatch_key
+	key = json.dumps([settings.get("scrapingTools", {}), settings.get("defaultScraper", "")], sort_keys=True)
+	with _dispatch_lock:
+		if key != _dispatch_key:
+			_dispatch = ScraperDispatch(settings)
+			_dispatch_key = key
+		return _dispatch
+
 def select_scraper_class(settings, format_type):
-	logger = setup_logger()
-	logger.debug(f"Selecting scraping tool for format type {format_type}")
-	tools = settings.get("scrapingTools", {})
-	default_scraper = settings.get("defaultScraper", "")
-	for tool_name, tool_data in tools.items():
-		if format_type in tool_data.get("format_types", []):
-			path = tool_data["path"]
-			logger.debug(f"Scraping tool \"{tool_name}\" selected for format code {format_type}")
-			return load_scraper_class(path)
-	# Use the user-defined default scraper if one can't be identified for this format_type
-	if default_scraper in tools:
-		logger.info(f"No scraper matched for format type {format_type}, returning default scraper ({default_scraper})")
-		return(load_scraper_class(tools[default_scraper]["path"]))
-	else:
-		logger.warning("default scraper could not be loaded")
-	# Throw an error if a scraper can't be identified and loading the default fails		
-	raise ValueError(f"No scraper found for format type {format_type}")
\ No newline at end of file
+	return get_scraper_dispatch(settings).lookup(format_type)
@@ -0,0 +1,345 @@
+# scraper_pool.py
+# Runs scraping tools in a pool of worker processes, so one pathological page (a huge table image,
+# a tesseract hang) costs a single job instead of stalling the audit or the review app.
+# Each page must come back within the timeout and each worker must stay under the memory limit;
+# a worker that breaks either is killed and replaced. Workers also keep their loaded tools
+# (and any models) between jobs, and are recycled between jobs if their memory has crept past the limit.
+# A tool can also be used through a stand-in class (remote_class), so it is never imported in this process.
+
+import os
+import time
+import queue
+import threading
+import multiprocessing
+from base_scraper import BaseScraper
+from logger import setup_logger
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+DEFAULT_TIMEOUT_S = 300
+DEFAULT_MAX_MEMORY_MB = 4096
+# How often a busy worker is checked (alive, memory) while waiting for its next page
+POLL_INTERVAL_S = 1.0
+
+
+class ScrapeTimeout(Exception):
+    """A page took longer than the pool's timeout; its worker was killed."""
+
+
+class ScrapeWorkerError(Exception):
+    """The scraper raised, or its worker died or went over the memory limit."""
+
+
+def _memory_bytes(pid):
+    """Resident memory of a process, or None where it can't be measured (no psutil and no /proc)."""
+    if psutil is not None:
+        try:
+            return psutil.Process(pid).memory_info().rss
+        except psutil.Error:
+            return None
+    try:
+        with open(f"/proc/{pid}/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def _worker_main(conn):
+    # Imported here so only the workers load PyMuPDF and the scraping tools
+    import fitz
+    from scraper_loader import load_scraper_class
+    classes = {}    # tool source path -> class, loaded once per worker
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            return  # The parent is gone
+        if job is None:
+            return
+        # Jobs are ("describe", tool), ("scrape", tool, doc_path, page_numbers, metadata)
+        # or ("call", tool, doc_path, page_numbers, metadata, output, method, args),
+        # where tool is (source_path, source_hash); a source_hash of None takes the file as it is
+        kind, (source_path, source_hash) = job[0], job[1]
+        try:
+            ScraperClass = classes.get(source_path)
+            if ScraperClass is None or (source_hash is not None and ScraperClass.source_hash != source_hash):
+                ScraperClass = classes[source_path] = load_scraper_class(source_path)
+            # Results are cached under the caller's version of the tool, so they must come from that code
+            if source_hash is not None and ScraperClass.source_hash != source_hash:
+                raise ValueError(f"{source_path} has changed since it was loaded; save the scraping tool settings to reload it")
+            if kind == "describe":
+                conn.send(("done", (ScraperClass.__name__, ScraperClass.source_hash, ScraperClass.capabilities())))
+                continue
+            doc_path, page_numbers, metadata = job[2:5]
+            with fitz.open(doc_path) as doc:
+                scraper = ScraperClass([doc.load_page(n) for n in page_numbers], metadata)
+                if kind == "scrape":
+                    for chunk in scraper.iter_scrape(collect=False):
+                        conn.send(("chunk", chunk))
+                    result = None
+                else:
+                    output, method, args = job[5:]
+                    scraper._output = output
+                    result = getattr(scraper, method)(*args)
+            conn.send(("done", result))
+        except Exception as e:
+            conn.send(("error", f"{type(e).__name__}: {e}"))
+
+
+def _tool(scraper):
+    """The (source_path, source_hash) a job names its tool by, from a scraper class or instance."""
+    return scraper.source_path, getattr(scraper, "source_hash", None)
+
+
+class _RemoteScraper(BaseScraper):
+    """
+    Base for the stand-ins returned by ScraperPool.remote_class. The tool itself only exists in the
+    workers: scraping, merging pages and any other method run there.
+    """
+    scraper_pool = None
+
+    def scrape(self):
+        self.load_chunks(list(self.scraper_pool.iter_scrape(self.__class__, self.pages, self.metadata)))
+
+    def _merge_chunks(self, chunks):
+        # Merged by the tool, which may override how its pages are combined
+        return self.scraper_pool.call(self, "_merge_chunks", chunks)
+
+
+class _Worker:
+    def __init__(self, context):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn,), name="scraper-worker", daemon=True)
+        self.process.start()
+        child_conn.close()
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.kill()
+        self.conn.close()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ScraperPool:
+    def __init__(self, workers=1, timeout_s=DEFAULT_TIMEOUT_S, max_memory_mb=DEFAULT_MAX_MEMORY_MB):
+        self.logger = setup_logger()
+        self.workers = workers
+        self.timeout_s = timeout_s
+        self.max_memory_bytes = max_memory_mb * 1024 * 1024
+        # Spawned rather than forked, like the audit process, so workers never inherit Qt or model threads
+        self._context = multiprocessing.get_context("spawn")
+        # One slot per worker: a running _Worker, or None for one that is started when the slot is next taken
+        self._idle = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(None)
+        self._all = set()
+        self._lock = threading.Lock()
+        self._remote_classes = {}   # tool source path -> stand-in class
+
+    def accepts(self, scraper_class, pages):
+        """
+        True if a scrape should run in the pool: the tool was loaded from a file and declares itself
+        process safe and not cheap, and the pages belong to a PDF on disk.
+        """
+        return (
+            getattr(scraper_class, "source_path", None) is not None
+            and getattr(scraper_class, "process_safe", False)
+            and getattr(scraper_class, "cost_class", "moderate") != "cheap"
+            and bool(pages)
+            and all(getattr(getattr(page, "parent", None), "name", "") for page in pages)
+        )
+
+    def iter_scrape(self, scraper_class, pages, metadata=None):
+        """
+        Yields validated per-page chunks, like scraper_class(pages, metadata).iter_scrape(collect=False),
+        from a worker process. Waits up to timeout_s for a worker to be free.
+        Raises ScrapeTimeout if a page takes longer than timeout_s, ScrapeWorkerError for anything else.
+        """
+        label = f"{scraper_class.__name__} on {os.path.basename(pages[0].parent.name)}"
+        job = ("scrape", _tool(scraper_class), pages[0].parent.name, [page.number for page in pages], metadata or {})
+        return self._run(job, label)
+
+    def call(self, scraper, method, *args):
+        """
+        Runs scraper.method(*args) in a worker, on a copy of the scraper with the same pages and output,
+        and returns its result (which must be picklable, e.g. render_overlay's PIL image).
+        """
+        pages = scraper.pages
+        label = f"{scraper.__class__.__name__}.{method} on {os.path.basename(pages[0].parent.name)}"
+        job = (
+            "call", _tool(scraper), pages[0].parent.name, [page.number for page in pages],
+            scraper.metadata, scraper._output, method, args,
+        )
+        return self._finish(job, label)
+
+    def remote_class(self, source_path):
+        """
+        A stand-in for the tool in source_path that is only ever loaded in the workers, so its imports
+        and models stay out of this process. It has the tool's name and declared capabilities, scrapes
+        through the pool, and its other methods can be run with call().
+        Raises ScrapeWorkerError if the tool can't be loaded.
+        """
+        source_path = os.path.abspath(source_path)
+        with self._lock:
+            stand_in = self._remote_classes.get(source_path)
+        if stand_in is None:
+            name, source_hash, capabilities = self._finish(("describe", (source_path, None)), os.path.basename(source_path))
+            stand_in = type(name, (_RemoteScraper,), dict(
+                capabilities, scraper_pool=self, source_path=source_path, source_hash=source_hash
+            ))
+            with self._lock:
+                self._remote_classes[source_path] = stand_in
+        return stand_in
+
+    def close(self):
+        """Stops every worker; jobs still running are killed."""
+        with self._lock:
+            workers, self._all = self._all, set()
+        for worker in workers:
+            if worker.process.is_alive():
+                worker.kill()
+            else:
+                worker.conn.close()
+
+    def _run(self, job, label):
+        """
+        Sends job to a free worker and yields its chunks, then returns its result.
+        A job the caller stops reading (e.g. a cancelled entry) is killed along with its worker,
+        so it never holds up the jobs waiting behind it.
+        """
+        worker = self._take()
+        done = False
+        try:
+            worker.conn.send(job)
+            while True:
+                try:
+                    kind, payload = self._receive(worker, label)
+                except Exception:
+                    self._discard(worker)
+                    worker = None
+                    raise
+                if kind == "chunk":
+                    yield payload
+                    continue
+                done = True
+                if kind == "error":
+                    raise ScrapeWorkerError(f"{label} failed: {payload}")
+                return payload
+        finally:
+            if worker is None:
+                self._idle.put(None)
+            elif done:
+                self._give_back(worker)
+            else:
+                self.logger.info(f"{label} abandoned, stopping its worker")
+                self._discard(worker)
+                self._idle.put(None)
+
+    def _finish(self, job, label):
+        """Runs a job that sends no chunks and returns its result."""
+        run = self._run(job, label)
+        while True:
+            try:
+                next(run)
+            except StopIteration as stop:
+                return stop.value
+
+    def _take(self):
+        try:
+            worker = self._idle.get(timeout=self.timeout_s)
+        except queue.Empty:
+            raise ScrapeWorkerError(f"No scraper worker became free within {self.timeout_s}s")
+        if worker is not None and worker.process.is_alive():
+            return worker
+        if worker is not None:
+            self._discard(worker)
+        worker = _Worker(self._context)
+        with self._lock:
+            self._all.add(worker)
+        self.logger.info(f"Started scraper worker process {worker.process.pid}")
+        return worker
+
+    def _give_back(self, worker):
+        # Recycled between jobs if memory has crept up (e.g. a leaking tool)
+        memory = _memory_bytes(worker.process.pid)
+        if memory is not None and memory > self.max_memory_bytes:
+            self.logger.info(f"Restarting scraper worker {worker.process.pid}, using {memory / 2**20:,.0f} MB")
+            with self._lock:
+                self._all.discard(worker)
+            worker.stop()
+            worker = None
+        self._idle.put(worker)
+
+    def _discard(self, worker):
+        with self._lock:
+            self._all.discard(worker)
+        if worker.process.is_alive():
+            worker.kill()
+        else:
+            worker.conn.close()
+
+    def _receive(self, worker, label):
+        """Waits for the worker's next message, enforcing the timeout and memory limit."""
+        deadline = time.monotonic() + self.timeout_s
+        while not worker.conn.poll(POLL_INTERVAL_S):
+            if not worker.process.is_alive():
+                raise ScrapeWorkerError(f"{label}: scraper worker exited unexpectedly (exit code {worker.process.exitcode})")
+            if time.monotonic() > deadline:
+                self.logger.warning(f"{label} timed out after {self.timeout_s}s, restarting its worker")
+                raise ScrapeTimeout(f"{label} took longer than {self.timeout_s}s on a page")
+            memory = _memory_bytes(worker.process.pid)
+            if memory is not None and memory > self.max_memory_bytes:
+                self.logger.warning(f"{label} went over {self.max_memory_bytes / 2**20:,.0f} MB, restarting its worker")
+                raise ScrapeWorkerError(f"{label} used more than {self.max_memory_bytes / 2**20:,.0f} MB")
+        try:
+            return worker.conn.recv()
+        except (EOFError, OSError) as e:
+            raise ScrapeWorkerError(f"{label}: lost contact with scraper worker ({e})")
+
+
+# One pool per process, configured from settings
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_scraper_pool(settings):
+    """Returns the shared ScraperPool configured in settings, or None if tools run in-process (scraperWorkers 0)."""
+    global _pool
+    try:
+        workers = int(settings.get("scraperWorkers", 0))
+        timeout_s = float(settings.get("scraperTimeoutSeconds", DEFAULT_TIMEOUT_S))
+        max_memory_mb = int(settings.get("scraperMaxMemoryMB", DEFAULT_MAX_MEMORY_MB))
+    except (TypeError, ValueError):
+        setup_logger().warning("Invalid scraper worker settings, running scraping tools in-process")
+        return None
+
+    with _pool_lock:
+        if _pool is not None and _pool.workers != workers:
+            _pool.close()
+            _pool = None
+        if workers <= 0:
+            return None
+        if _pool is None:
+            _pool = ScraperPool(workers, timeout_s, max_memory_mb)
+        _pool.timeout_s = timeout_s
+        _pool.max_memory_bytes = max_memory_mb * 1024 * 1024
+        return _pool
+
+def close_scraper_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -1,6 +1,9 @@
 from base_scraper import BaseScraper
 
 class TextScraper(BaseScraper):
+    # Reads the PDF text layer only
+    cost_class = "cheap"
+
     def scrape(self):
         try:
             all_text = [page.get_text("text") for page in self.pages]
@@ -18,5 +21,13 @@ class TextScraper(BaseScraper):
             "method": "TextScraper"
         }
 
-
-
+    # Pages scraped one at a time are merged with the status scrape() gives the whole document
+    def _merge_chunks(self, chunks):
+        merged = super()._merge_chunks(chunks)
+        if any(str(chunk.get("status", "")).startswith("FATAL ERROR") for chunk in chunks):
+            merged["status"] = "FATAL ERROR"
+        elif not any((t or "").strip() for t in merged["text"]):
+            merged["status"] = "No Text Found"
+        else:
+            merged["status"] = f"OK: {len(merged['text'])} pages scraped"
+        return merged
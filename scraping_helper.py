@@ -16,11 +16,9 @@ from PyQt5.QtWidgets import (
     QMessageBox,
     QDialog,
     QInputDialog,
-    QComboBox,
-    QTextBrowser
+    QComboBox
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QImage
+from PyQt5.QtCore import Qt, QTimer
 
 # local imports
 
@@ -28,8 +26,19 @@ from settings_window import SettingsDialog
 from app_settings import load_settings, save_settings
 from mid_manager import MIDManager
 from logger import setup_logger
-from scraper_loader import select_scraper_class
-from audit_runner import run_mid_audit
+from audit_job import AuditJob
+from audit_dashboard import AuditDashboard
+from corpus_search import CorpusSearchIndex
+from image_utils import render_cache, fitz_lock
+from entry_loader import open_mid_entry, scrape_mid_entry, EntryLoadError
+from entry_prefetcher import EntryPrefetcher
+from scrape_runner import ScrapeRunner
+from page_viewer import PageViewer
+from table_viewer import TableViewer
+from review_journal import ReviewJournal, journal_path, replay, latest_decisions
+from review_leases import LeaseStore, LeaseSession, default_reviewer, mid_key
+from scraper_loader import get_scraper_dispatch
+from scraper_pool import close_scraper_pool
 
 
 # Ensure project root is in sys.path
@@ -48,6 +57,7 @@ class TextScrapingReviewApp(QMainWindow):
 
         self.settings = load_settings()
         self.mode = self.settings.get("userMode", "User").lower()
+        self.apply_render_cache_limit()
         self.mid_df = None
         self.current_mid_index = 0
         self.use_table_view = False # Switches based on the format type of the loaded Document
@@ -56,7 +66,9 @@ class TextScrapingReviewApp(QMainWindow):
         mid_path = self.settings.get("MIDLocation", "")
         if mid_path:
             try:
-                self.mid_manager = MIDManager(mid_path)
+                self.mid_manager = MIDManager(
+                    mid_path, self.mid_sheet_name(), data_dir=self.settings.get("dataDirectory", "")
+                )
                 self.logger.info("Successfully loaded MID")
             except Exception as e:
                 self.logger.error(f"Failed to Load MID: {e}")
@@ -76,22 +88,58 @@ class TextScrapingReviewApp(QMainWindow):
         self.current_agency_yr = None   # Agency-year field
         self.scraped_text = ""          # Text to display in RH column
         self.page_text_cache = []       # List of strings, each containing the text of a page
+        self.page_tables_cache = []     # List of table record lists per page (table formats only)
+        self.pages_scraped = set()      # Indices into page_indices whose scrape results have arrived
 
         self.info_labels = {}           # Dictionary of info to display in UI
-        self.manual_review = {          # Structure for tracking user Accept/Rejects (will likely be changed)
-            "active_test": None,
-            "results": {},  # format: {row_index: {"status": "ACCEPT" or "REJECT", "label": ..., "pages": [...]}}
-        }
-
+        self.reset_manual_review()
+
+        # Decisions are recorded under this name, both in the journal and in the shared lease store
+        self.reviewer = self.settings.get("reviewerName", "") or default_reviewer()
+
+        # Every decision is appended to the journal on a background thread; past sessions are replayed from it
+        self.review_journal = ReviewJournal(journal_path(self.settings))
+        self.journal_records = replay(self.review_journal.path)
+        self.logger.info(f"Replayed {len(self.journal_records):,} review decisions from {self.review_journal.path}")
+        if self.review_journal.error:
+            QMessageBox.warning(self, "Review Journal", f"{self.review_journal.error}\n\nReview decisions will not be saved to the journal this session.")
+
+
+        # Background loading of the next MID entries
+        self.review_direction = "next"
+        self.prefetcher = EntryPrefetcher(self.settings, depth=self.prefetch_depth(), parent=self)
+
+        # Scraping runs in a worker thread; results for the current job arrive through these signals
+        self.scrape_runner = ScrapeRunner(self.settings, parent=self)
+        self.scrape_runner.page_ready.connect(self.on_scrape_page_ready)
+        self.scrape_runner.progress.connect(self.on_scrape_progress)
+        self.scrape_runner.failed.connect(self.on_scrape_failed)
+        self.scrape_runner.finished.connect(self.on_scrape_finished)
+        self.scrape_target = None       # "entry" while scraping a whole entry, ("page", page index) for Scrape Page
+
+        # The audit runs in a worker process; its rows stream into the dashboard and into audit_results
+        self.audit_job = AuditJob(self)
+        self.audit_job.row_finished.connect(self.on_audit_row)
+        self.audit_job.finished.connect(self.on_audit_finished)
+        self.audit_job.failed.connect(self.on_audit_failed)
+        self.audit_dashboard = None
+        self.audit_results = None       # Entries of the audit started in this session, None to use the saved report
 
         # Set up file structure if it doesn't exist
         self.init_files()
 
         self.init_ui()
 
+        # Rows leased from the shared review store, when several reviewers split the MID
+        self.lease_session = None
+        self.lease_timer = QTimer(self)
+        self.lease_timer.timeout.connect(self.renew_leases)
+        self.start_lease_session()
+        self.check_scraper_dispatch()
+
         # Attempt to load the first document
         if hasattr(self, "mid_manager") and self.mid_manager.df is not None:
-            success = self.load_mid_entry_document()
+            success = self.load_first_valid_entry()
             if not success:
                 self.logger.warning("First MID row failed to load; check file accessibility or page numbers.")
             else:
@@ -114,6 +162,16 @@ class TextScrapingReviewApp(QMainWindow):
         self.entry_index_label.setStyleSheet("font-weight: bold;")
         info_layout.addWidget(self.entry_index_label)
 
+        # Invalid rows jumped over by the last navigation; hover for the reasons
+        self.skip_label = QLabel("")
+        self.skip_label.setWordWrap(True)
+        info_layout.addWidget(self.skip_label)
+
+        # Shared review store status (only shown when reviewStorePath is set)
+        self.lease_label = QLabel("")
+        self.lease_label.setWordWrap(True)
+        info_layout.addWidget(self.lease_label)
+
 
         # Set information fields
         if self.mode == "dev":
@@ -155,6 +213,15 @@ class TextScrapingReviewApp(QMainWindow):
         control_layout.addWidget(scrape_btn)
         self.logger.debug("Added Scrape Page button")
 
+        self.cancel_scrape_btn = QPushButton("Cancel Scrape")
+        self.cancel_scrape_btn.clicked.connect(self.cancel_scrape)
+        self.cancel_scrape_btn.setEnabled(False)
+        control_layout.addWidget(self.cancel_scrape_btn)
+        self.logger.debug("Added Cancel Scrape button")
+
+        self.scrape_status_label = QLabel("Scrape: idle")
+        control_layout.addWidget(self.scrape_status_label)
+
         accept_btn = QPushButton("Accept")
         accept_btn.clicked.connect(self.accept_scrape)
         control_layout.addWidget(accept_btn)
@@ -175,6 +242,11 @@ class TextScrapingReviewApp(QMainWindow):
         control_layout.addWidget(prev_entry_btn)
         self.logger.debug("Added Previous MID Entry button")
 
+        search_btn = QPushButton("Search Document")
+        search_btn.clicked.connect(self.search_document)
+        control_layout.addWidget(search_btn)
+        self.logger.debug("Added Search Document button")
+
         settings_btn = QPushButton("Settings")
         settings_btn.clicked.connect(self.open_settings)
         control_layout.addWidget(settings_btn)
@@ -222,18 +294,19 @@ class TextScrapingReviewApp(QMainWindow):
 
         # --- Viewer Panel ---
         splitter = QSplitter(Qt.Horizontal)
-        # PDF Page Display
-        self.pdf_label = QLabel("Load a document to begin.")
-        self.pdf_label.setAlignment(Qt.AlignCenter)
-        splitter.addWidget(self.pdf_label)
+        # PDF Page Display (renders at the viewer's size, wheel to zoom, drag to pan)
+        self.pdf_viewer = PageViewer("Load a document to begin.")
+        splitter.addWidget(self.pdf_viewer)
 
         # Scraped Text Display
         self.text_edit = QTextEdit()
         self.text_edit.setReadOnly(False)  # Allow manual correction
         splitter.addWidget(self.text_edit)
 
-        # Table structured display
-        self.table_viewer = QTextBrowser()
+        # Table structured display; cell edits go back into the page text, selected cells are outlined on the page
+        self.table_viewer = TableViewer()
+        self.table_viewer.table_text_edited.connect(self.on_table_edited)
+        self.table_viewer.highlight_changed.connect(self.pdf_viewer.set_highlights)
         splitter.addWidget(self.table_viewer)
         self.table_viewer.hide()
 
@@ -244,6 +317,24 @@ class TextScrapingReviewApp(QMainWindow):
         # hide the dev mode labels if in user mode and v.v.
         self.update_mode_ui()
 
+    # Bound the shared page render cache by the user's memory setting
+    def apply_render_cache_limit(self):
+        try:
+            cache_mb = int(self.settings.get("renderCacheMB", 256))
+        except (TypeError, ValueError):
+            self.logger.warning("Invalid renderCacheMB setting, keeping the current render cache size")
+            return
+        render_cache.set_max_bytes(cache_mb * 1024 * 1024)
+        self.logger.debug(f"Render cache limited to {cache_mb} MB")
+
+    # Number of upcoming MID entries to load in the background
+    def prefetch_depth(self):
+        try:
+            return max(int(self.settings.get("prefetchDepth", 3)), 0)
+        except (TypeError, ValueError):
+            self.logger.warning("Invalid prefetchDepth setting, defaulting to 3")
+            return 3
+
     # Create Necessary File Structure
     def init_files(self):
         # Check if the "./data" directory exists; if not, create it
@@ -291,7 +382,7 @@ class TextScrapingReviewApp(QMainWindow):
         self.logger.debug("Updating info labels")
         page_num = self.page_indices[self.current_page_index] + 1 if self.page_indices else self.current_page_index + 1
         row = None
-        mid_length = len(self.mid_manager.df)
+        mid_length = len(self.mid_manager)
         row = self.mid_manager.get_current_row()
         current_mid_index = self.mid_manager.current_index
 
@@ -336,7 +427,8 @@ class TextScrapingReviewApp(QMainWindow):
 
         self.current_agency_yr = os.path.splitext(os.path.basename(path))[0]
         self.logger.info(f"Loading docuemnt for agency_yr: {self.current_agency_yr}")
-        self.doc = fitz.open(path)
+        with fitz_lock:
+            self.doc = fitz.open(path)
         self.current_page_index = 0
 
         self.show_page()
@@ -348,102 +440,97 @@ class TextScrapingReviewApp(QMainWindow):
             self.logger.error("No MID row found")
             return False
 
-        # Extract necessary information from the row
-        agency = row.get("agency", "UNKNOWN").strip()
-        year = str(row.get("year", "UNKNOWN")).strip()
-        agency_yr = row.get("agency_yr", "").strip()
-        label = f"{agency} ({year})"
+        index = self.mid_manager.current_index
+        self.current_agency_yr = row.get("agency_yr", "").strip()
 
-        if not agency_yr:
-            self.logger.error(f"MID row missing 'agency_yr' for {label}")
-            return False
-
-        self.current_agency_yr = agency_yr
-
-        # Load the file
-        # Handle any hyphen-underscore mixups
-        filename = f"{agency_yr.replace('-','_')}.pdf"
-        path = os.path.join(self.settings.get("dataDirectory", ""), filename)
+        # A scrape still running for the previous entry is no longer wanted
+        self.scrape_runner.cancel()
 
-        if not os.path.isfile(path):
-            self.logger.error(f"PDF not found for MID row {label} - expected file: {filename}")
+        # Use the background prefetch if it already has this row
+        entry = self.prefetcher.take(index)
+        if isinstance(entry, EntryLoadError):
+            self.logger.error(str(entry))
             return False
-        try:
-            self.doc = fitz.open(path)
-            self.page_indices = self.mid_manager.parse_pdf_pages()
-
-            if not self.page_indices:
-                self.logger.error(f"No valid pages found for {label} - PDF Page number field: '{row.get('PDF Page Number', '')}' ")
-                return False
-
-            self.page_text_cache = [""] * len(self.page_indices)
 
+        if entry is None:
             try:
-                ScraperClass = select_scraper_class(self.settings, int(row.get("Format_Type", -1)))
-                pages = [self.doc.load_page(p) for p in self.page_indices]
-                Scraper = ScraperClass(pages)
-                Scraper.scrape()
-                result = Scraper.result
-                
-                text_result = result.get("text", [])
-                if not isinstance(text_result, list):
-                    raise ValueError("Expected a list of strings from the Scraper!")
-
-                if len(text_result) != len(self.page_indices):
-                    self.logger.warning(f"Scraper returned {len(text_result)} pages, expected {len(self.page_indices)}")
-
-                self.page_text_cache = text_result
-                self.logger.info(f"Scraped {len(self.page_text_cache)} pages from {label}")    
-
-            except Exception as e:
-                self.logger.error(f"Failed to scrape all pages for {label}: {e}")
-
+                entry = open_mid_entry(row, self.mid_manager.parse_pdf_pages(), self.settings)
+            except EntryLoadError as e:
+                self.logger.error(str(e))
+                return False
 
-            format_type = int(row.get("Format_Type", -1))
-            self.use_table_view = format_type in [1,5,6,7,10,11,14,16,17,18]
-            if self.use_table_view:
-                self.text_edit.hide()
-                self.table_viewer.show()
-            else:
-                self.table_viewer.hide()
-                self.text_edit.show()
+        try:
+            self.apply_entry(entry)
 
             # self.current_page_index = 0
             # # PyMuPDF is 0-indexed, add 1 to match user's expected range
             # display_pages = [p+1 for p in self.page_indices]
             # self.logger.info(f"Loaded {filename} for {label}, pages: {display_pages}")
             self.show_page()
-            return True
 
         except Exception as e:
-            self.logger.error(f"Error loading {filename} for {label}: {e}")
+            self.logger.error(f"Error loading {os.path.basename(entry['path'])} for {entry['label']}: {e}")
             return False
 
+        if entry["scraped"]:
+            self.logger.info(f"Loaded prefetched entry for {entry['label']}")
+        else:
+            # Scrape in the background; pages fill in as they arrive
+            self.scrape_runner.start(entry["path"], entry["page_indices"], entry["format_type"], entry["label"])
+            self.scrape_target = "entry"
 
-    def show_page(self):
-        self.logger.debug("Attempting to display a new document page")
+        # Start loading the next entries in the direction the reviewer is moving
+        self.prefetcher.prefetch(
+            self.mid_manager, self.review_direction, self.pdf_viewer.render_size(), next_index=self.peek_review_index
+        )
+        return True
+
+    # Point the viewer at a loaded entry and pick the display mode for its format type
+    def apply_entry(self, entry):
+        self.current_agency_yr = entry["agency_yr"]
+        self.doc = entry["doc"]
+        self.page_indices = entry["page_indices"]
+        self.page_text_cache = entry["page_text_cache"]
+        self.page_tables_cache = entry["page_tables_cache"]
+        # A prefetched entry was scraped in full (pages that failed count as done)
+        self.pages_scraped = set(range(len(self.page_indices))) if entry["scraped"] else set()
+        self.table_viewer.clear_edits()
+
+        self.use_table_view = entry["use_table_view"]
+        if self.use_table_view:
+            self.text_edit.hide()
+            self.table_viewer.show()
+        else:
+            self.table_viewer.hide()
+            self.text_edit.show()
+
+
+    # Returns the fitz.Page currently selected for display, or None if no document is loaded
+    def current_page(self):
         if not self.doc:
-            self.logger.warning("Could not load document!")
-            return
+            return None
         if self.page_indices:
             page_number = self.page_indices[self.current_page_index]
         else:
             self.logger.warning("No page reference found, defaulting to page 1!")
             page_number = self.current_page_index
         self.logger.debug(f"Attempting to load index {self.current_page_index}, page {page_number}")
-        page = self.doc.load_page(page_number)
-
-        # Render the page and upscale by 2x
-        pix = page.get_pixmap(matrix=fitz.Matrix(2, 2))
-        img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format_RGB888)
-        pixmap = QPixmap.fromImage(img)
-        self.pdf_label.setPixmap(
-            pixmap.scaled(self.pdf_label.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation)
-        )
+        with fitz_lock:
+            return self.doc.load_page(page_number)
+
+    def show_page(self):
+        self.logger.debug("Attempting to display a new document page")
+        page = self.current_page()
+        if page is None:
+            self.logger.warning("Could not load document!")
+            return
+
+        # Render the page at the viewer's resolution (shared with the prefetcher through the render cache)
+        self.pdf_viewer.set_page(page)
 
-        text_content = self.page_text_cache[self.current_page_index]
         if self.use_table_view:
-            self.table_viewer.setHtml(text_content)
+            tables = self.page_tables_cache[self.current_page_index] if self.current_page_index < len(self.page_tables_cache) else []
+            self.table_viewer.set_page(page, tables)
         else:
             if 0 <= self.current_page_index < len(self.page_text_cache):
                 self.text_edit.setPlainText(self.page_text_cache[self.current_page_index])
@@ -456,17 +543,27 @@ class TextScrapingReviewApp(QMainWindow):
         # Display document information
         self.update_info_labels()
 
-    # Simple UI update function when the window size is changed
-    def resizeEvent(self, event):
-        self.logger.debug("Window resized")
-        super().resizeEvent(event)
-        self.show_page()
+    # Keep manual corrections to the plain-text view (table edits arrive through on_table_edited)
+    def save_text_edits(self):
+        if not self.use_table_view and 0 <= self.current_page_index < len(self.page_text_cache):
+            self.page_text_cache[self.current_page_index] = self.text_edit.toPlainText()
+
+    # Replaces only the edited table's text in the page text, keeping the rest of the page and earlier edits
+    def on_table_edited(self, previous_text, table_text):
+        if not 0 <= self.current_page_index < len(self.page_text_cache):
+            return
+        page_text = self.page_text_cache[self.current_page_index]
+        if previous_text and previous_text in page_text:
+            page_text = page_text.replace(previous_text, table_text, 1)
+        else:
+            page_text = f"{page_text}\n\n{table_text}" if page_text else table_text
+        self.page_text_cache[self.current_page_index] = page_text
 
     # Advances to next page and scrapes it
     def next_page(self):
         self.logger.debug("Attempting to load next page")
         if self.page_indices and self.current_page_index < len(self.page_indices) - 1:
-            self.page_text_cache[self.current_page_index] = self.text_edit.toPlainText()
+            self.save_text_edits()
             self.logger.debug("Next page is valid")
             self.current_page_index += 1
             self.show_page()
@@ -477,7 +574,7 @@ class TextScrapingReviewApp(QMainWindow):
     def prev_page(self):
         self.logger.debug("Attempting to load previous page")
         if self.page_indices and self.current_page_index > 0:
-            self.page_text_cache[self.current_page_index] = self.text_edit.toPlainText()
+            self.save_text_edits()
             self.logger.debug("Previous page is valid")
             self.current_page_index -= 1
             self.show_page()
@@ -502,86 +599,171 @@ class TextScrapingReviewApp(QMainWindow):
         else:
             actual_page_number = self.current_page_index
 
-        try:
-            # For now, hardcode this to pull the basic text scraper
-            # TODO: grab the user's scraper-doctype mappings for scraper selection
-            ScraperClass = select_scraper_class(self.settings, format_type)
-
-
-            # Extract the current page to scrape
+        # The scraper runs in a worker thread, the result is shown by on_scrape_page_ready
+        self.scrape_runner.start(self.doc.name, [actual_page_number], format_type, self.current_agency_yr)
+        self.scrape_target = ("page", self.current_page_index)
 
-            page = self.doc.load_page(actual_page_number)
-            
-            # Create a scraper instance for the page
-            scraper = ScraperClass([page])
-            scraper.scrape()
-            result = scraper.result
-
-            self.scraped_text = result.get("text", [""])
-            self.text_edit.setPlainText(self.scraped_text[0])
-
-            # Add 1, as actual_page_number is 0-indexed
-            self.logger.debug(f"Scraped page {actual_page_number+1}")
+    # Scrapes the pages of the current entry that have no results yet, e.g. after a cancelled scrape
+    def scrape_remaining_pages(self):
+        row = self.mid_manager.get_current_row()
+        format_type = int(row.get("Format_Type", -1))
+        self.scrape_runner.start(self.doc.name, self.page_indices, format_type, self.current_agency_yr)
+        self.scrape_target = "entry"
+
+    def cancel_scrape(self):
+        self.scrape_runner.cancel()
+        self.logger.info("Scrape cancelled by user")
+
+    # Accept/Reject save the entry's page text, so every page must have been scraped first.
+    # Offers to scrape the missing pages; returns True if the entry is complete.
+    def entry_ready_to_save(self, action):
+        if self.scrape_target == "entry" and self.scrape_runner.is_running():
+            QMessageBox.warning(self, action, "Scraping is still running for this entry. Wait for it to finish or cancel it first.")
+            return False
+        missing = len(self.page_indices) - len(self.pages_scraped)
+        if missing <= 0:
+            return True
+        answer = QMessageBox.question(
+            self, action,
+            f"{missing} page(s) of this entry have not been scraped, so their text would be saved empty.\n\n"
+            "Scrape them now?"
+        )
+        if answer == QMessageBox.Yes:
+            self.scrape_remaining_pages()
+        return False
+
+    # --- Scrape job signal handlers (only ever called for the current job) ---
+    def on_scrape_page_ready(self, page_idx, text, tables):
+        if self.scrape_target == "entry":
+            # Pages that already have results (and possibly the reviewer's edits) are left alone
+            if 0 <= page_idx < len(self.page_text_cache) and page_idx not in self.pages_scraped:
+                self.page_text_cache[page_idx] = text
+                self.page_tables_cache[page_idx] = tables
+                self.pages_scraped.add(page_idx)
+                if page_idx == self.current_page_index:
+                    self.show_page()
+        elif self.scrape_target is not None:
+            _, target_page_index = self.scrape_target
+            self.scraped_text = [text]
+            if target_page_index < len(self.page_text_cache):
+                self.page_text_cache[target_page_index] = text
+                self.pages_scraped.add(target_page_index)
+            if target_page_index < len(self.page_tables_cache):
+                self.page_tables_cache[target_page_index] = tables
+            if target_page_index == self.current_page_index:
+                if self.use_table_view:
+                    self.table_viewer.set_page(self.current_page(), tables)
+                else:
+                    self.text_edit.setPlainText(text)
+            # Add 1, as page_indices are 0-indexed
+            page_number = self.page_indices[target_page_index] + 1 if self.page_indices else target_page_index + 1
+            self.logger.debug(f"Scraped page {page_number}")
+
+    def on_scrape_progress(self, done, total):
+        self.cancel_scrape_btn.setEnabled(done < total)
+        self.scrape_status_label.setText(f"Scrape: {done} of {total} page(s)")
+
+    def on_scrape_failed(self, message):
+        if self.scrape_target == "entry":
+            self.logger.error(f"Scrape failed for {self.current_agency_yr}: {message}")
+            self.scrape_status_label.setText("Scrape: failed, see log")
+        else:
+            self.logger.critical(f"failed to scrape page: {message}")
+            QMessageBox.critical(self, "Scrape Error", message)
 
-        except Exception as e:
-            self.logger.critical(f"failed to scrape page {actual_page_number+1}: {e}")
-            QMessageBox.critical(self, "Scrape Error", str(e))
+    def on_scrape_finished(self, cancelled):
+        self.cancel_scrape_btn.setEnabled(False)
+        if cancelled:
+            self.scrape_status_label.setText("Scrape: cancelled")
+        self.scrape_target = None
 
 
     def accept_scrape(self):
+        # Don't save an entry whose pages are still being filled in, or were never scraped
+        if self.doc and not self.entry_ready_to_save("Accept"):
+            return
+
         if self.mode == "dev":
             if self.manual_review["active_test"]:
-                idx = self.mid_manager.current_index
-                row = self.mid_manager.get_current_row()
-                pages = [self.page_indices[self.current_page_index]] if self.page_indices else []
-                self.manual_review["results"][idx] = {
-                    "status": "ACCEPT",
-                    "label": row.get("agency_yr", f"Index {idx}"),
-                    "pages": pages
-                }
-                self.logger.info(f"Manually accepted row {idx}")
+                if not self.record_review_decision("ACCEPT"):
+                    return
             # User is not reviewing a test
             else:
                 QMessageBox.warning(self, "Accept", "No active test! Switch to user mode to review scraping results or select a test")
         # User is in User mode
         else:
             if self.doc:
-                agency_yr = self.current_agency_yr.replace("-","_")
-                output_path = os.path.join(self.accept_dir, f"{agency_yr}_full.txt")
-                full_text = "\n\n".join(self.page_text_cache)
-                with open(output_path, "w", encoding = "utf-8") as f:
-                    # use the contents of the text edit window in case the user made manual edits
-                    f.write(full_text)
-                self.logger.info(f"Saved accepted scrape to {output_path}")
+                self.save_reviewed_text("ACCEPT", self.accept_dir)
 
         # Outside conditional
         self.next_mid_entry()
 
 
     def reject_scrape(self):
+        if self.doc and not self.entry_ready_to_save("Reject"):
+            return
+
         if self.mode == "dev":
             if self.manual_review["active_test"]:
-                idx = self.mid_manager.current_index
-                row = self.mid_manager.get_current_row()
-                pages = [self.page_indices[self.current_page_index]] if self.page_indices else []
-                self.manual_review["results"][idx] = {
-                    "status": "REJECT",
-                    "label": row.get("agency_yr", f"Index {idx}"),
-                    "pages": pages
-                }
-                self.logger.info(f"Manually rejected row {idx}")
-                self.next_mid_entry()
+                if self.record_review_decision("REJECT"):
+                    self.next_mid_entry()
             else:
                 QMessageBox.warning(self, "Reject", "No active test! Switch to user mode to review scraping results or select a test")
         # User Mode:
         else:
             if self.doc:
-                agency_yr = self.current_agency_yr.replace("-","_")
-                output_path = os.path.join(self.reject_dir, f"{agency_yr}_full.txt")
-                full_text = "\n\n".join(self.page_text_cache)
-                with open(output_path, "w", encoding = "utf-8") as f:
-                    f.write(full_text)
-                self.logger.info(f"Saved rejected scrape to {output_path}")
+                self.save_reviewed_text("REJECT", self.reject_dir)
+
+    # Structure for tracking user Accept/Rejects, mirrors the review journal
+    def reset_manual_review(self):
+        self.manual_review = {
+            "active_test": None,
+            "results": {},  # format: {row_index: {"status": "ACCEPT" or "REJECT", "label": ..., "pages": [...]}}
+            "audit_indices": [],  # audit report index of each row in the failure view
+        }
+
+    # Dev mode: journal a decision on the current audit failure and mirror it in manual_review.
+    # Returns False if the current row isn't one of the failures being reviewed.
+    def record_review_decision(self, status):
+        idx = self.mid_manager.current_index
+        if not 0 <= idx < len(self.manual_review["audit_indices"]):
+            self.logger.error(f"Row {idx} is not one of the {len(self.manual_review['audit_indices'])} audit failures under review")
+            QMessageBox.warning(self, "Review", "This row is not one of the audit failures being reviewed. Load the failures again.")
+            return False
+        row = self.mid_manager.get_current_row()
+        pages = [self.page_indices[self.current_page_index]] if self.page_indices else []
+        decision = {
+            "status": status,
+            "label": row.get("agency_yr", f"Index {idx}"),
+            "pages": pages
+        }
+        self.manual_review["results"][idx] = decision
+        record = self.review_journal.record(
+            mode="dev", reviewer=self.reviewer, test=self.manual_review["active_test"],
+            audit_index=self.manual_review["audit_indices"][idx], **decision
+        )
+        self.journal_records.append(record)
+        self.logger.info(f"Manually {status.lower()}ed row {idx}")
+        return True
+
+    # User mode: journal the decision and hand the page text to the journal thread to write out
+    def save_reviewed_text(self, status, output_dir):
+        agency_yr = self.current_agency_yr.replace("-","_")
+        output_path = os.path.join(output_dir, f"{agency_yr}_full.txt")
+        # use the page cache rather than re-scraping, in case the user made manual edits
+        full_text = "\n\n".join(self.page_text_cache)
+        self.review_journal.write_text(output_path, full_text)
+        record = self.review_journal.record(
+            mode="user", reviewer=self.reviewer, status=status, label=self.current_agency_yr,
+            pages=list(self.page_indices), output_path=output_path
+        )
+        self.journal_records.append(record)
+        if self.lease_session is not None:
+            self.lease_session.decide(
+                self.mid_manager.current_index, status, self.current_agency_yr, list(self.page_indices)
+            )
+            self.lease_label.setText(self.lease_session.status_text())
+        self.logger.info(f"Queued {status.lower()}ed scrape for {output_path}")
 
 
 
@@ -596,37 +778,145 @@ class TextScrapingReviewApp(QMainWindow):
         # self.scrape_page()
 
 
-    # Handle any missing entries or pages that can't be loaded
+    # Jump to the nearest valid entry using the MID's validity index; entries that still fail to load are skipped too
     def advance_to_valid_entry(self, direction="next"):
+        self.review_direction = direction
+        start_index = self.mid_manager.current_index
         while True:
-            if direction == "next":
-                self.mid_manager.next_mid_entry()
-            elif direction == "prev":
-                self.mid_manager.prev_mid_entry()
-
-            if self.mid_manager.get_current_row() is None:
+            target = self.next_review_index(direction)
+            if target is None:
                 self.logger.warning("Reached end of MID entries with no valid document found")
+                self.show_skipped_entries(start_index, self.mid_manager.current_index)
                 QMessageBox.warning(self, "No More Entries", "No further valid documents were found")
-                break
+                return False
 
-            success = self.load_mid_entry_document()
-            if success:
+            self.mid_manager.current_index = target
+            if self.load_mid_entry_document():
+                self.show_skipped_entries(start_index, target)
                 self.update_info_labels()
-                break
-            else:
-                current_index = self.mid_manager.current_index
-                self.logger.warning(f"Skipping invalid MID entry at index {current_index}")
+                if self.lease_session is not None:
+                    self.lease_label.setText(self.lease_session.status_text())
+                return True
+
+            self.logger.warning(f"Skipping invalid MID entry at index {target}")
+            self.mid_manager.mark_invalid(target, "document failed to load, see log")
+
+    # Load the current entry, or the next valid one if the validity index rules it out
+    def load_first_valid_entry(self):
+        # With a shared store, start from the first row leased to this reviewer
+        if self.lease_session is not None:
+            self.mid_manager.current_index = -1
+            return self.advance_to_valid_entry(direction="next")
+        if self.mid_manager.is_valid(self.mid_manager.current_index):
+            if self.load_mid_entry_document():
+                return True
+            self.mid_manager.mark_invalid(self.mid_manager.current_index, "document failed to load, see log")
+        return self.advance_to_valid_entry(direction="next")
+
+    # Next row to review: the next leased row when sharing the MID with other reviewers, otherwise the next valid row
+    def next_review_index(self, direction="next"):
+        if self.lease_session is not None:
+            return self.lease_session.next_row(self.mid_manager, direction)
+        return self.mid_manager.next_valid_index(direction)
+
+    # Same as next_review_index from any row, without leasing more rows (used by the prefetcher)
+    def peek_review_index(self, direction, index):
+        if self.lease_session is not None:
+            return self.lease_session.peek_row(self.mid_manager, direction, index)
+        return self.mid_manager.next_valid_index(direction, index)
+
+    # Join the shared review store if one is configured (user mode only, dev mode reviews audit failures)
+    def start_lease_session(self):
+        self.stop_lease_session()
+        store_path = self.settings.get("reviewStorePath", "")
+        if not store_path or self.mode.lower() == "dev" or not hasattr(self, "mid_manager"):
+            return
+        try:
+            lease_seconds = max(int(self.settings.get("reviewLeaseMinutes", 30)), 1) * 60
+            batch_size = max(int(self.settings.get("reviewBatchSize", 20)), 1)
+            store = LeaseStore(store_path)
+        except Exception as e:
+            self.logger.error(f"Could not open the shared review store at {store_path}: {e}")
+            QMessageBox.warning(self, "Review Store", f"Could not open the shared review store, reviewing alone.\n\n{e}")
+            return
+        self.lease_session = LeaseSession(store, mid_key(self.settings), self.reviewer, batch_size, lease_seconds)
+        # Renew well before the leases run out
+        self.lease_timer.start(lease_seconds * 1000 // 3)
+        self.logger.info(f"Sharing MID rows through {store_path} as {self.reviewer}")
+
+    def stop_lease_session(self):
+        if self.lease_session is None:
+            return
+        self.lease_timer.stop()
+        try:
+            self.lease_session.close()
+        except Exception as e:
+            self.logger.warning(f"Failed to release review leases: {e}")
+        self.lease_session = None
+        self.lease_label.setText("")
+
+    def renew_leases(self):
+        if self.lease_session is None:
+            return
+        try:
+            self.lease_session.renew()
+            self.lease_label.setText(self.lease_session.status_text())
+        except Exception as e:
+            self.logger.warning(f"Failed to renew review leases: {e}")
+
+    # Report the invalid rows a jump went past, with their reasons in the tooltip
+    def show_skipped_entries(self, start_index, end_index):
+        skipped = self.mid_manager.skipped_between(start_index, end_index)
+        if self.mid_manager.skip_reasons.get(start_index) and start_index != end_index:
+            skipped.insert(0, (start_index, self.mid_manager.skip_reasons[start_index]))
+        if not skipped:
+            self.skip_label.setText("")
+            self.skip_label.setToolTip("")
+            return
+
+        lines = [f"Entry {index + 1:,}: {reason}" for index, reason in skipped]
+        for line in lines:
+            self.logger.info(f"Skipped MID {line}")
+        self.skip_label.setText(f"Skipped {len(skipped):,} invalid entr{'y' if len(skipped) == 1 else 'ies'} (hover for reasons)")
+        self.skip_label.setToolTip("\n".join(lines[:50] + ([f"... and {len(lines) - 50:,} more, see log"] if len(lines) > 50 else [])))
+
+    # Look up which pages of the current document contain some text, using the corpus search index
+    def search_document(self):
+        if not self.current_agency_yr:
+            QMessageBox.warning(self, "Search Document", "Load a document before searching.")
+            return
+
+        index_path = self.settings.get("corpusIndexPath", "")
+        if not index_path or not os.path.isfile(index_path):
+            QMessageBox.warning(self, "Search Document", "No corpus index found. Build one by running corpus_search.py.")
+            return
+
+        phrase, ok = QInputDialog.getText(self, "Search Document", f"Find text in {self.current_agency_yr}:")
+        if not ok or not phrase.strip():
+            return
+
+        index = CorpusSearchIndex(index_path)
+        try:
+            if not index.is_indexed(self.current_agency_yr):
+                QMessageBox.information(self, "Search Document", f"{self.current_agency_yr} has not been indexed yet.")
+                return
+            found_pages = index.find_pages(self.current_agency_yr, phrase)
+        finally:
+            index.close()
+
+        self.logger.info(f"Searched {self.current_agency_yr} for '{phrase}': pages {found_pages}")
+        if found_pages:
+            QMessageBox.information(self, "Search Document", f"Found on page(s): {', '.join(str(p) for p in found_pages)}")
+        else:
+            QMessageBox.information(self, "Search Document", "Text not found in this document.")
 
     # Creates an instance of SettingsWindow for user to update settings
     def open_settings(self):
         self.logger.debug("Attempting to open Settings")
 
-        # Save the old MID path in case the user enters an invalid path
+        # Save the old MID path and sheet to tell whether a different MID was picked
         old_mid_path = self.settings.get("MIDLocation", "")
-        if hasattr(self, "mid_manager"):
-            old_mid_df = self.mid_manager.df
-        else:
-            old_mid_df = None
+        old_sheet_name = self.mid_sheet_name()
 
         dialog = SettingsDialog(self.settings, self)
 
@@ -637,19 +927,31 @@ class TextScrapingReviewApp(QMainWindow):
             save_settings(self.settings)
             self.mode = self.settings.get("userMode", "User")
             self.update_mode_ui()
+            self.apply_render_cache_limit()
+            self.prefetcher.update_settings(self.settings, depth=self.prefetch_depth())
+            self.scrape_runner.settings = self.settings
+
+            self.reviewer = self.settings.get("reviewerName", "") or default_reviewer()
 
             new_mid_path = self.settings.get("MIDLocation", "")
-            if new_mid_path is not None:
-                self.mid_manager = MIDManager(new_mid_path)
-            else:
-                QMessageBox.error("You must select a MID to use the app!")
+            data_dir = self.settings.get("dataDirectory", "")
+            if not new_mid_path:
+                QMessageBox.critical(self, "MID Location not Specified", "You must select a MID to use the app!")
                 self.logger.error("User did not select a MID")
                 return
-            if new_mid_path != old_mid_path or old_mid_path == "":
-                self.logger.info("User updated MID location, attempting to read new data")
-                try:
-                    sheet_name = self.settings.get("MIDSheetName", 0)
-                    self.mid_manager.df = self.mid_manager.load_mid(new_mid_path, sheet_name=sheet_name)
+
+            # The MID is always reloaded, so a workbook edited in place is picked up; its snapshot
+            # decides whether Excel is parsed again. The previous MIDManager stays if loading fails.
+            mid_changed = (not hasattr(self, "mid_manager") or new_mid_path != old_mid_path
+                           or self.mid_sheet_name() != old_sheet_name)
+            try:
+                self.mid_manager = MIDManager(new_mid_path, self.mid_sheet_name(), data_dir=data_dir)
+                # Failure review rows index the old MID's view, which the reload dropped
+                if self.manual_review["active_test"]:
+                    self.logger.info(f"MID reloaded, leaving manual review of '{self.manual_review['active_test']}'")
+                self.reset_manual_review()
+                if mid_changed:
+                    self.logger.info("User updated MID location, read new data")
                     QMessageBox.information(self, "MID Reloaded", "Master Input Document Loaded Successfully")
                     summary = (
                         f"MID loaded successfully.\n\n"
@@ -662,23 +964,77 @@ class TextScrapingReviewApp(QMainWindow):
                     self.logger.info(summary)
                     QMessageBox.information(self, "MID Summary", summary)
 
-                except Exception as e:
-                    self.mid_manager.df = old_mid_df
-                    self.logger.critical(f"Error Loading MID: {e}")
+            except Exception as e:
+                self.logger.critical(f"Error Loading MID: {e}")
+                if hasattr(self, "mid_manager"):
                     self.logger.warning("Previous MID State Recovered")
                     QMessageBox.critical(self, "Error Loading MID", f"Previous MID state restored. \n\n{str(e)}")
-            
+                else:
+                    QMessageBox.critical(self, "Error Loading MID", str(e))
+                    return
+            self.start_lease_session()
+            self.check_scraper_dispatch(show_problems=True)
+
+    # Builds the Format_Type -> scraper table for the current settings (a no-op if they haven't changed)
+    # and reports scraping tools that failed to load, duplicate mappings, and MID format types with no scraper
+    def check_scraper_dispatch(self, show_problems=False):
+        dispatch = get_scraper_dispatch(self.settings)
+        problems = list(dispatch.problems)
+        if hasattr(self, "mid_manager"):
+            unmapped = dispatch.unmapped(self.mid_manager.indexes["format_type"])
+            if unmapped:
+                fallback = f'"{dispatch.default_name}"' if dispatch.default is not None else "nothing (they can't be scraped)"
+                message = f"MID format types with no scraping tool of their own: {unmapped}, these fall back to {fallback}"
+                self.logger.warning(message)
+                problems.append(message)
+        if show_problems and problems:
+            QMessageBox.warning(self, "Scraping Tools", "\n\n".join(problems))
 
+    # Sheet of the MID workbook to use; a blank setting means the first sheet
+    def mid_sheet_name(self):
+        return self.settings.get("MIDSheetName", "") or 0
 
-    # runs the suite of MID audit functions defined in audit_runner.py
+
+    # runs the suite of MID audit functions defined in audit_runner.py in a background process
     def run_mid_audit(self):
-        self.logger.info("Starting MID Audit")
-        try:
-            output_path = run_mid_audit(self.mid_manager, self.settings)
-            QMessageBox.information(self, "Audit Complete", f"Audit Complete! Output saved to:\n{output_path}")
-        except Exception as e:
-            self.logger.critical(f"AUDIT FAILED: {e}")
-            QMessageBox.critical(self, "Audit Error", str(e))
+        if self.audit_dashboard is None:
+            test_names = [self.failure_test_combo.itemText(i) for i in range(self.failure_test_combo.count())]
+            self.audit_dashboard = AuditDashboard(test_names, self)
+            self.audit_dashboard.stop_requested.connect(self.audit_job.stop)
+            self.audit_dashboard.review_requested.connect(self.load_audit_failures)
+
+        if not self.audit_job.is_running():
+            self.logger.info("Starting MID Audit")
+            # Always audit the full MID, so row numbers in the report match the MID file
+            mid_df = self.mid_manager.source_df
+            try:
+                self.audit_job.start(mid_df, self.settings)
+            except Exception as e:
+                self.logger.critical(f"AUDIT FAILED: {e}")
+                QMessageBox.critical(self, "Audit Error", str(e))
+                return
+            self.audit_results = []
+            self.audit_dashboard.start(len(mid_df))
+
+        self.audit_dashboard.show()
+        self.audit_dashboard.raise_()
+
+    def on_audit_row(self, entry, done, total):
+        self.audit_results.append(entry)
+        self.audit_dashboard.add_result(entry, done, total)
+
+    def on_audit_finished(self, output_path, stopped):
+        if stopped:
+            message = f"Audit stopped after {len(self.audit_results):,} rows. Partial report saved to {output_path}"
+        else:
+            message = f"Audit complete! Output saved to {output_path}"
+        self.logger.info(message)
+        self.audit_dashboard.finish(message)
+
+    def on_audit_failed(self, message):
+        self.logger.critical(f"AUDIT FAILED: {message}")
+        self.audit_dashboard.finish(f"Audit failed: {message}")
+        QMessageBox.critical(self, "Audit Error", message)
 
     # basic handler for the fialure loading function below
     def handle_load_failures(self):
@@ -689,27 +1045,48 @@ class TextScrapingReviewApp(QMainWindow):
     # Restrict the MID to only entries where the file failed the selected test. Default to cases where the doc loaded but wasn't scraped
     def load_audit_failures(self, test_name="text_scraped"):
         try:
-            log_path = os.path.join(self.settings.get("logFileDirectory", "./logs"), "audit_report.json")
-            with open(log_path, "r", encoding="utf-8") as f:
-                audit_results = json.load(f)
+            # Rows from this session's audit (possibly still running), otherwise the last saved report
+            if self.audit_results is not None:
+                audit_results = list(self.audit_results)
+            else:
+                log_path = os.path.join(self.settings.get("logFileDirectory", "./logs"), "audit_report.json")
+                with open(log_path, "r", encoding="utf-8") as f:
+                    audit_results = json.load(f)
 
+            # Rows where the test timed out have no verdict yet, so they are reviewed along with the failures
             failed_indices = [
                 entry["index"]
                 for entry in audit_results
-                if entry.get("tests", {}).get(test_name) == "FAIL"
+                if entry.get("tests", {}).get(test_name) in ("FAIL", "TIMEOUT")
             ]
 
             if not failed_indices:
                 QMessageBox.information(self, "No Failures", f"No failures found for test: {test_name}")
                 return
 
-            self.mid_manager.restrict_to_rows(failed_indices)
+            self.prefetcher.clear()
+            # Leased row numbers refer to the full MID, so the shared store is set aside while reviewing failures
+            if self.lease_session is not None:
+                self.logger.info("Releasing review leases while audit failures are being reviewed")
+                self.stop_lease_session()
+            # Audit indices are 1-indexed for human readers
+            self.mid_manager.restrict_to_rows([index - 1 for index in failed_indices])
             self.logger.info(f"Loaded {len(failed_indices)} failure rows for test '{test_name}' into MID view")
-            self.load_mid_entry_document()
+            self.load_first_valid_entry()
             
+            # Pick up where earlier sessions left off on this test
+            decisions = latest_decisions(self.journal_records, test_name)
             self.manual_review["active_test"] = test_name
-            self.manual_review["results"] = {}
-            self.logger.info(f"Manual review mode enabled for test '{test_name}'")
+            self.manual_review["audit_indices"] = failed_indices
+            self.manual_review["results"] = {
+                row_index: {key: decisions[audit_index][key] for key in ("status", "label", "pages")}
+                for row_index, audit_index in enumerate(failed_indices)
+                if audit_index in decisions
+            }
+            self.logger.info(
+                f"Manual review mode enabled for test '{test_name}', "
+                f"{len(self.manual_review['results'])} earlier decision(s) restored from the journal"
+            )
 
 
 
@@ -717,13 +1094,20 @@ class TextScrapingReviewApp(QMainWindow):
             self.logger.error(f"Failed to load audit failures for '{test_name}': {e}")
             QMessageBox.critical(self, "Error", f"Could not load failures for test '{test_name}':\n{e}")
 
-    # Save manual reveiw results to JSON (Dev mode only)
+    # Save a snapshot of the journalled review results to JSON (Dev mode only)
     def export_review_results(self):
         if not self.manual_review["active_test"]:
             QMessageBox.information(self, "Not in Review Mode", "You must be in manual review mode to export results.")
             return
 
         try:
+            # The results mirror the journal; make sure the journal is on disk before the snapshot is
+            if not self.review_journal.flush():
+                QMessageBox.warning(
+                    self, "Review Journal",
+                    f"The review journal could not be written ({self.review_journal.error or 'timed out'}).\n"
+                    "The export still contains this session's decisions."
+                )
             filename = f"{self.manual_review['active_test']}_review.json"
             output_path = os.path.join(self.settings.get("logFileDirectory", "./logs"), filename)
             with open(output_path, "w", encoding="utf-8") as f:
@@ -735,6 +1119,15 @@ class TextScrapingReviewApp(QMainWindow):
             self.logger.error(f"Failed to export review results: {e}")
             QMessageBox.critical(self, "Export Error", str(e))
 
+    # Finish writing queued decisions and files before the app exits
+    def closeEvent(self, event):
+        self.scrape_runner.cancel()
+        self.audit_job.shutdown()
+        close_scraper_pool()
+        self.stop_lease_session()
+        self.review_journal.close()
+        super().closeEvent(event)
+
 
 
 if __name__ == '__main__':
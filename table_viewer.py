@@ -0,0 +1,187 @@
+# table_viewer.py
+# Structured display of TableScraper output in the review app.
+# Each detected table is shown as a grid built from its "table row" and "table column" structures.
+# TableModel is a QAbstractTableModel, so the view only asks for the cells that are on screen and
+# a cell's text is pulled from the page's word index the first time it is displayed.
+# Edited cells are kept by the viewer (the table records are shared with the scrape cache and the
+# prefetcher) and only the edited table's text is replaced in the page text.
+# Selecting cells highlights their boxes on the page image.
+
+import fitz  # PyMuPDF
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QComboBox, QTableView, QLabel, QAbstractItemView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, pyqtSignal
+from word_index import get_word_index
+from image_utils import document_key
+
+
+# Scale TableScraper boxes were recorded at, for records that predate the render_scale field
+DEFAULT_TABLE_RENDER_SCALE = 2.0
+
+
+def _rect(bbox, scale):
+    return fitz.Rect(bbox["x1"], bbox["y1"], bbox["x2"], bbox["y2"]) / scale
+
+
+class TableModel(QAbstractTableModel):
+    """Grid over one table record; cell text is extracted lazily and cached."""
+    def __init__(self, table_record, page, edits, parent=None):
+        super().__init__(parent)
+        self.record = table_record
+        self.page = page
+        scale = table_record.get("render_scale", DEFAULT_TABLE_RENDER_SCALE)
+
+        # Cell (r, c) is where row r and column c overlap; a table without structure is a single cell
+        self.table_rect = _rect(table_record["table_box_page"], scale)
+        structures = table_record.get("structures", [])
+        self.row_rects = sorted(
+            (_rect(s["bbox_page"], scale) for s in structures if s.get("label") == "table row"), key=lambda r: r.y0
+        ) or [self.table_rect]
+        self.col_rects = sorted(
+            (_rect(s["bbox_page"], scale) for s in structures if s.get("label") == "table column"), key=lambda r: r.x0
+        ) or [self.table_rect]
+
+        self.edits = edits  # "row,col" -> text typed by the reviewer, owned by the TableViewer
+        self._text = {}  # (row, col) -> extracted text, filled as cells become visible
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.row_rects)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.col_rects)
+
+    def cell_rect(self, row, col):
+        """Box of a cell in PDF coordinates."""
+        return fitz.Rect(
+            self.col_rects[col].x0, self.row_rects[row].y0, self.col_rects[col].x1, self.row_rects[row].y1
+        ) & self.table_rect
+
+    def cell_text(self, row, col):
+        edited = self.edits.get(f"{row},{col}")
+        if edited is not None:
+            return edited
+        if (row, col) not in self._text:
+            self._text[(row, col)] = get_word_index(self.page).text_in_rect(self.cell_rect(row, col)).strip()
+        return self._text[(row, col)]
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role in (Qt.DisplayRole, Qt.EditRole, Qt.ToolTipRole):
+            return self.cell_text(index.row(), index.column())
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        self.edits[f"{index.row()},{index.column()}"] = str(value)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemIsEditable
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            return str(section + 1)
+        return None
+
+    def scraped_text(self):
+        """The table's text as TableScraper put it in the page text: the embedded text of the table region."""
+        return get_word_index(self.page).text_in_rect(self.table_rect).strip()
+
+    def to_text(self):
+        """The table as tab-separated lines, one per row."""
+        return "\n".join(
+            "\t".join(self.cell_text(r, c) for c in range(self.columnCount()))
+            for r in range(self.rowCount())
+        )
+
+
+class TableViewer(QWidget):
+    # Emitted after a cell is edited, with the table's previous text in the page text and its new text
+    table_text_edited = pyqtSignal(str, str)
+    # Emitted with the fitz.Rects (PDF coordinates) to highlight on the page image
+    highlight_changed = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.table_combo = QComboBox()
+        self.table_combo.currentIndexChanged.connect(self.show_table)
+        layout.addWidget(self.table_combo)
+
+        self.empty_label = QLabel("No tables detected on this page.")
+        self.empty_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(self.empty_label)
+
+        self.view = QTableView()
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setWordWrap(False)
+        layout.addWidget(self.view)
+
+        self.page = None
+        self.models = []
+        # Per table, keyed by (document, page number, table index): the reviewer's cell edits,
+        # and the text currently standing for the table in the page text
+        self._edits = {}
+        self._table_text = {}
+
+    def clear_edits(self):
+        """Forgets the cell edits, e.g. when a new entry is loaded."""
+        self._edits.clear()
+        self._table_text.clear()
+
+    def set_page(self, page, table_records):
+        """Shows the tables scraped from a fitz.Page (records from TableScraper's "tables" output)."""
+        self.page = page
+        self.models = [
+            TableModel(record, page, self._edits.setdefault(self._table_key(i), {}), self)
+            for i, record in enumerate(table_records)
+        ]
+        for i, model in enumerate(self.models):
+            model.dataChanged.connect(lambda *_, i=i: self.on_cell_edited(i))
+
+        self.table_combo.blockSignals(True)
+        self.table_combo.clear()
+        for i, model in enumerate(self.models, start=1):
+            self.table_combo.addItem(f"Table {i} ({model.rowCount()} x {model.columnCount()})")
+        self.table_combo.blockSignals(False)
+
+        has_tables = bool(self.models)
+        self.table_combo.setVisible(len(self.models) > 1)
+        self.view.setVisible(has_tables)
+        self.empty_label.setVisible(not has_tables)
+        if has_tables:
+            self.show_table(0)
+        else:
+            self.view.setModel(None)
+            self.highlight_changed.emit([])
+
+    def show_table(self, table_index):
+        if not 0 <= table_index < len(self.models):
+            return
+        model = self.models[table_index]
+        self.view.setModel(model)
+        self.view.selectionModel().selectionChanged.connect(self.on_selection_changed)
+        self.highlight_changed.emit([model.table_rect])
+
+    def on_selection_changed(self, *_):
+        model = self.view.model()
+        if model is None:
+            return
+        rects = [model.cell_rect(i.row(), i.column()) for i in self.view.selectionModel().selectedIndexes()]
+        self.highlight_changed.emit(rects or [model.table_rect])
+
+    def on_cell_edited(self, table_index):
+        key = self._table_key(table_index)
+        model = self.models[table_index]
+        previous = self._table_text.get(key)
+        if previous is None:
+            previous = model.scraped_text()
+        self._table_text[key] = model.to_text()
+        self.table_text_edited.emit(previous, self._table_text[key])
+
+    def _table_key(self, table_index):
+        return (document_key(self.page.parent), self.page.number, table_index)
@@ -0,0 +1,150 @@
+# word_index.py
+# Per-page spatial index over the words of a PDF page.
+# The page text is extracted once with get_text("words") and stored as compact NumPy arrays,
+# bucketed into a uniform grid. Region queries only look at the grid cells they overlap,
+# so clipping text for a table, a row, or a single cell no longer re-extracts the whole page.
+
+import threading
+from collections import OrderedDict
+import numpy as np
+import fitz  # PyMuPDF
+from image_utils import document_key, fitz_lock
+
+
+GRID_SIZE = 16              # The page is split into GRID_SIZE x GRID_SIZE buckets
+MAX_CACHED_PAGES = 256      # Number of page indexes kept in the shared cache
+
+
+class PageWordIndex:
+    def __init__(self, words, page_rect, grid_size=GRID_SIZE):
+        """
+        Parameters:
+            words: output of fitz.Page.get_text("words") - (x0, y0, x1, y1, word, block_no, line_no, word_no)
+            page_rect: fitz.Rect of the page, in the same coordinate space as the words
+            grid_size: number of grid buckets along each axis
+        """
+        count = len(words)
+        self.words = [w[4] for w in words]
+        self.boxes = np.array([w[:4] for w in words], dtype=np.float32).reshape(count, 4)
+        self.order = np.array([w[5:8] for w in words], dtype=np.int32).reshape(count, 3)  # block, line, word
+        self.page_rect = fitz.Rect(page_rect)
+        self.grid_size = grid_size
+        self._cell_w = max(self.page_rect.width / grid_size, 1e-6)
+        self._cell_h = max(self.page_rect.height / grid_size, 1e-6)
+
+        # Register every word in each grid cell its box overlaps, then store the buckets
+        # in CSR form: words of cell c are _cell_words[_cell_start[c]:_cell_start[c + 1]]
+        col0, col1 = self._cols(self.boxes[:, 0]), self._cols(self.boxes[:, 2])
+        row0, row1 = self._rows(self.boxes[:, 1]), self._rows(self.boxes[:, 3])
+        cell_ids, word_ids = [], []
+        for i in range(count):
+            for gy in range(row0[i], row1[i] + 1):
+                for gx in range(col0[i], col1[i] + 1):
+                    cell_ids.append(gy * grid_size + gx)
+                    word_ids.append(i)
+        cell_ids = np.asarray(cell_ids, dtype=np.int32)
+        word_ids = np.asarray(word_ids, dtype=np.int32)
+        by_cell = np.argsort(cell_ids, kind="stable")
+        self._cell_words = word_ids[by_cell]
+        self._cell_start = np.searchsorted(cell_ids[by_cell], np.arange(grid_size * grid_size + 1))
+
+    @classmethod
+    def from_page(cls, page, grid_size=GRID_SIZE):
+        with fitz_lock:
+            words, page_rect = page.get_text("words"), page.rect
+        return cls(words, page_rect, grid_size)
+
+    def __len__(self):
+        return len(self.words)
+
+    def _cols(self, x):
+        return np.clip(((np.asarray(x) - self.page_rect.x0) // self._cell_w).astype(np.int32), 0, self.grid_size - 1)
+
+    def _rows(self, y):
+        return np.clip(((np.asarray(y) - self.page_rect.y0) // self._cell_h).astype(np.int32), 0, self.grid_size - 1)
+
+    def query(self, rect, mode="center"):
+        """
+        Returns the ids of the words in rect, in reading order.
+
+        mode:
+            "center"     - the word's center point lies inside rect (closest to get_text clipping)
+            "intersects" - any part of the word overlaps rect
+            "contains"   - the whole word lies inside rect
+        """
+        rect = fitz.Rect(rect)
+        if not len(self.words) or rect.is_empty:
+            return np.empty(0, dtype=np.int32)
+
+        # Candidate words come only from the grid cells the rectangle touches.
+        # Cells in one grid row are contiguous, so each row is a single slice.
+        col0, col1 = int(self._cols(rect.x0)), int(self._cols(rect.x1))
+        row0, row1 = int(self._rows(rect.y0)), int(self._rows(rect.y1))
+        slices = [
+            self._cell_words[self._cell_start[gy * self.grid_size + col0]:self._cell_start[gy * self.grid_size + col1 + 1]]
+            for gy in range(row0, row1 + 1)
+        ]
+        candidates = np.unique(np.concatenate(slices))
+        if not len(candidates):
+            return candidates
+
+        b = self.boxes[candidates]
+        if mode == "contains":
+            mask = (b[:, 0] >= rect.x0) & (b[:, 1] >= rect.y0) & (b[:, 2] <= rect.x1) & (b[:, 3] <= rect.y1)
+        elif mode == "intersects":
+            mask = (b[:, 0] < rect.x1) & (b[:, 2] > rect.x0) & (b[:, 1] < rect.y1) & (b[:, 3] > rect.y0)
+        elif mode == "center":
+            cx = (b[:, 0] + b[:, 2]) / 2
+            cy = (b[:, 1] + b[:, 3]) / 2
+            mask = (cx >= rect.x0) & (cx <= rect.x1) & (cy >= rect.y0) & (cy <= rect.y1)
+        else:
+            raise ValueError(f"Unknown word query mode: {mode}")
+
+        hits = candidates[mask]
+        o = self.order[hits]
+        return hits[np.lexsort((o[:, 2], o[:, 1], o[:, 0]))]
+
+    def words_in_rect(self, rect, mode="center"):
+        """Returns (x0, y0, x1, y1, word) tuples for the words in rect, in reading order."""
+        return [(*self.boxes[i].tolist(), self.words[i]) for i in self.query(rect, mode)]
+
+    def text_in_rect(self, rect, mode="center"):
+        """Rebuilds plain text for rect: words joined by spaces, one line of the PDF per line."""
+        lines = []
+        current_line, current_words = None, []
+        for i in self.query(rect, mode):
+            line_key = (self.order[i, 0], self.order[i, 1])
+            if line_key != current_line and current_words:
+                lines.append(" ".join(current_words))
+                current_words = []
+            current_line = line_key
+            current_words.append(self.words[i])
+        if current_words:
+            lines.append(" ".join(current_words))
+        return "\n".join(lines)
+
+
+# Shared cache so every scraper handling the same page reuses one index
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+def get_word_index(page):
+    """Returns the PageWordIndex for a fitz.Page, building it on first use."""
+    key = (document_key(page.parent), page.number)
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = PageWordIndex.from_page(page)
+
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > MAX_CACHED_PAGES:
+            _index_cache.popitem(last=False)
+    return index
+
+def clear_word_index_cache():
+    with _index_lock:
+        _index_cache.clear()